@@ -4,12 +4,13 @@ Billing and subscription API endpoints
 import stripe
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.db.database import get_db
 from app.core.config import settings
+from app.api.schemas import CheckoutSessionEvent, SubscriptionEvent, InvoiceEvent
 from app.models.user import User
 from app.models.subscription import Subscription, PaymentHistory, SubscriptionUsage
 from app.dependencies.auth import get_current_active_user
@@ -295,32 +296,38 @@ async def stripe_webhook(
 
         # Handle different event types
         event_type = event['type']
+        event_object = event['data']['object']
         logger.info(f"Received Stripe webhook: {event_type}")
 
         if event_type == 'checkout.session.completed':
             # Payment successful
-            await StripeService.handle_checkout_completed(event['data']['object'], db)
-
-        elif event_type == 'customer.subscription.updated':
-            # Subscription updated
-            await StripeService.handle_subscription_updated(event['data']['object'], db)
+            await StripeService.handle_checkout_completed(
+                CheckoutSessionEvent.model_validate(event_object), db
+            )
 
-        elif event_type == 'customer.subscription.deleted':
-            # Subscription cancelled
-            await StripeService.handle_subscription_updated(event['data']['object'], db)
+        elif event_type in ('customer.subscription.updated', 'customer.subscription.deleted'):
+            # Subscription updated or cancelled
+            await StripeService.handle_subscription_updated(
+                SubscriptionEvent.model_validate(event_object), db
+            )
 
         elif event_type == 'invoice.paid':
             # Invoice paid successfully
-            await StripeService.handle_invoice_paid(event['data']['object'], db)
+            await StripeService.handle_invoice_paid(
+                InvoiceEvent.model_validate(event_object), db
+            )
 
         elif event_type == 'invoice.payment_failed':
             # Payment failed
-            logger.warning(f"Payment failed for invoice: {event['data']['object']['id']}")
+            logger.warning(f"Payment failed for invoice: {event_object['id']}")
 
         return {'status': 'success'}
 
     except HTTPException:
         raise
+    except ValidationError as e:
+        logger.error(f"Unexpected webhook payload for {event_type}: {e}")
+        raise HTTPException(status_code=400, detail="Invalid payload")
     except Exception as e:
         logger.error(f"Webhook processing error: {e}")
         raise HTTPException(
@@ -173,7 +173,7 @@ class ReverseGeocodeResponse(BaseModel):
 # Sync schemas
 class SyncRequest(BaseModel):
     source: Optional[str] = None  # 'park4night', 'campercontact', 'local_sites', or None for all
-    batch_size: int = Field(100, ge=1, le=1000)
+    batch_size: int = Field(1000, ge=1, le=1000)
     limit: Optional[int] = None
 
 
@@ -450,3 +450,43 @@ class PlanSuggestResponse(BaseModel):
     # Whether preferences were applied
     personalized: bool
     preferences_applied: Optional[UserPreferencesInput] = None
+
+
+# ============ Stripe Webhook Schemas ============
+
+class CheckoutSessionMetadata(BaseModel):
+    """Metadata attached to the checkout session at creation time"""
+    user_id: int
+    tier: str
+
+
+class CheckoutSessionEvent(BaseModel):
+    """checkout.session.completed payload"""
+    subscription: str
+    metadata: CheckoutSessionMetadata
+
+
+class SubscriptionEvent(BaseModel):
+    """customer.subscription.updated / deleted payload"""
+    id: str
+    status: str
+    current_period_start: int
+    current_period_end: int
+    cancel_at_period_end: bool = False
+    canceled_at: Optional[int] = None
+
+
+class InvoiceStatusTransitions(BaseModel):
+    paid_at: Optional[int] = None
+
+
+class InvoiceEvent(BaseModel):
+    """invoice.paid payload"""
+    id: str
+    customer: str
+    payment_intent: Optional[str] = None
+    amount_paid: int
+    currency: str
+    description: Optional[str] = 'Subscription payment'
+    invoice_pdf: Optional[str] = None
+    status_transitions: InvoiceStatusTransitions
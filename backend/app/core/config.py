@@ -49,6 +49,7 @@ class Settings(BaseSettings):
     EVENT_CLEANUP_ENABLED: bool = True
     EVENT_CLEANUP_RETENTION_DAYS: int = 0  # Delete immediately when end_date passes
     EVENT_CLEANUP_SCHEDULE_HOURS: int = 24  # Run cleanup daily
+    EVENT_CLEANUP_BATCH_SIZE: int = 5000  # Rows deleted per transaction
 
     # Authentication
     SECRET_KEY: str = "CHANGE_THIS_IN_PRODUCTION_use-at-least-32-random-characters"
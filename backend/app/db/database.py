@@ -1,9 +1,23 @@
 from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator, AsyncGenerator
+from typing import Any, Generator, AsyncGenerator
+import orjson
 from app.core.config import settings
 
+
+def _json_serializer(obj: Any) -> str:
+    """
+    Serialize JSON/JSONB bind values with orjson instead of the stdlib.
+
+    Used for every JSON column on the sync engine, so accept what the
+    stdlib did: non-string keys (e.g. Trip.user_ratings keyed by
+    location_id) and numpy scalars.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
 # Create async SQLAlchemy engine
 async_engine = create_async_engine(
     settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
@@ -20,11 +34,23 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
-# Create synchronous engine for compatibility
+# Create synchronous engine for compatibility (also used by the sync importers).
+# values_plus_batch makes psycopg2 page executemany() calls instead of sending
+# one statement per parameter set; INSERTs are batched as multi-row VALUES.
+# The pool is sized for several concurrent importers (keep Celery worker
+# concurrency <= pool_size). Tasks check connections out once per import or
+# cleanup chunk, so pre-ping is cheap and catches connections that went stale
+# while idle between scheduled runs; they are also recycled hourly.
 engine = create_engine(
     settings.DATABASE_URL,
+    pool_size=20,
+    max_overflow=10,
     pool_pre_ping=True,
+    pool_recycle=3600,
     echo=settings.DEBUG,
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    json_serializer=_json_serializer,
 )
 
 # Create synchronous SessionLocal class
@@ -76,7 +102,9 @@ def get_source_db_connection(db_name: str):
                  'uitinvlaanderen', 'eventbrite', 'ticketmaster'
 
     Returns:
-        SQLAlchemy engine for the source database
+        SQLAlchemy engine for the source database. It does not pool
+        connections: an import opens a single streaming connection and
+        closes it when done, so a reused engine holds no idle connections.
     """
     db_urls = {
         "park4night": settings.SOURCE_DB_PARK4NIGHT,
@@ -91,4 +119,4 @@ def get_source_db_connection(db_name: str):
     if not db_url:
         raise ValueError(f"Source database URL not configured for: {db_name}")
 
-    return create_engine(db_url, pool_pre_ping=True)
+    return create_engine(db_url, poolclass=NullPool)
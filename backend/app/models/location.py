@@ -115,6 +115,10 @@ class Location(Base, TimestampMixin):
     is_featured = Column(Boolean, default=False)
     requires_booking = Column(Boolean, default=False)
 
+    # Event dates (location_type EVENT only; UTC)
+    event_start_datetime = Column(DateTime)
+    event_end_datetime = Column(DateTime)
+
     # Sync metadata
     raw_data = Column(JSONB)
     last_verified_at = Column(DateTime)
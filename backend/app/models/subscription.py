@@ -38,7 +38,7 @@ class Subscription(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationship
-    # user = relationship("User", back_populates="subscription")
+    user = relationship("User", back_populates="subscription")
 
     def __repr__(self):
         return f"<Subscription(id={self.id}, user_id={self.user_id}, tier='{self.tier}', status='{self.status}')>"
@@ -47,6 +47,8 @@ class User(Base):
 
     # Relationships
     trips = relationship("Trip", back_populates="user", cascade="all, delete-orphan")
+    subscription = relationship("Subscription", back_populates="user", uselist=False)
+    usage = relationship("SubscriptionUsage", uselist=False)
 
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}')>"
@@ -6,8 +6,10 @@ from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
+from sqlalchemy.orm import joinedload
 
 from app.core.config import settings
+from app.api.schemas import CheckoutSessionEvent, SubscriptionEvent, InvoiceEvent
 from app.models.subscription import Subscription, PaymentHistory, SubscriptionUsage
 from app.models.user import User
 import logging
@@ -18,6 +20,11 @@ logger = logging.getLogger(__name__)
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
 
+def _ts(timestamp: Optional[int]) -> Optional[datetime]:
+    """Convert a Stripe Unix timestamp to a datetime, passing None through"""
+    return datetime.fromtimestamp(timestamp) if timestamp else None
+
+
 class StripeService:
     """Service for handling Stripe payment operations"""
 
@@ -142,7 +149,7 @@ class StripeService:
 
     @staticmethod
     async def handle_checkout_completed(
-        session: Dict[str, Any],
+        session: CheckoutSessionEvent,
         db: AsyncSession
     ):
         """
@@ -150,68 +157,54 @@ class StripeService:
         Called by webhook
         """
         try:
-            user_id = int(session['metadata']['user_id'])
-            tier = session['metadata']['tier']
-            subscription_id = session['subscription']
+            user_id = session.metadata.user_id
+            tier = session.metadata.tier
 
             # Fetch subscription details from Stripe
-            stripe_subscription = stripe.Subscription.retrieve(subscription_id)
+            stripe_subscription = stripe.Subscription.retrieve(session.subscription)
 
-            # Create or update subscription record
+            # Load user together with subscription and usage in one query
             result = await db.execute(
-                select(Subscription).where(Subscription.user_id == user_id)
+                select(User)
+                .options(joinedload(User.subscription), joinedload(User.usage))
+                .where(User.id == user_id)
             )
-            subscription = result.scalar_one_or_none()
+            user = result.scalar_one_or_none()
 
-            if subscription:
-                # Update existing
-                subscription.stripe_subscription_id = stripe_subscription.id
-                subscription.stripe_customer_id = stripe_subscription.customer
-                subscription.stripe_price_id = stripe_subscription['items']['data'][0]['price']['id']
-                subscription.tier = tier
-                subscription.status = stripe_subscription.status
-                subscription.current_period_start = datetime.fromtimestamp(stripe_subscription.current_period_start)
-                subscription.current_period_end = datetime.fromtimestamp(stripe_subscription.current_period_end)
-                subscription.trial_start = datetime.fromtimestamp(stripe_subscription.trial_start) if stripe_subscription.trial_start else None
-                subscription.trial_end = datetime.fromtimestamp(stripe_subscription.trial_end) if stripe_subscription.trial_end else None
-            else:
-                # Create new
-                subscription = Subscription(
-                    user_id=user_id,
-                    stripe_subscription_id=stripe_subscription.id,
-                    stripe_customer_id=stripe_subscription.customer,
-                    stripe_price_id=stripe_subscription['items']['data'][0]['price']['id'],
-                    tier=tier,
-                    status=stripe_subscription.status,
-                    current_period_start=datetime.fromtimestamp(stripe_subscription.current_period_start),
-                    current_period_end=datetime.fromtimestamp(stripe_subscription.current_period_end),
-                    trial_start=datetime.fromtimestamp(stripe_subscription.trial_start) if stripe_subscription.trial_start else None,
-                    trial_end=datetime.fromtimestamp(stripe_subscription.trial_end) if stripe_subscription.trial_end else None,
-                )
-                db.add(subscription)
+            if not user:
+                raise ValueError(f"User {user_id} not found")
 
-            # Update user subscription tier
-            await db.execute(
-                update(User)
-                .where(User.id == user_id)
-                .values(subscription_tier=tier)
+            # Create or update subscription record
+            values = dict(
+                stripe_subscription_id=stripe_subscription.id,
+                stripe_customer_id=stripe_subscription.customer,
+                stripe_price_id=stripe_subscription['items']['data'][0]['price']['id'],
+                tier=tier,
+                status=stripe_subscription.status,
+                current_period_start=_ts(stripe_subscription.current_period_start),
+                current_period_end=_ts(stripe_subscription.current_period_end),
+                trial_start=_ts(stripe_subscription.trial_start),
+                trial_end=_ts(stripe_subscription.trial_end),
             )
 
-            # Create or reset usage tracking
-            usage_result = await db.execute(
-                select(SubscriptionUsage).where(SubscriptionUsage.user_id == user_id)
-            )
-            usage = usage_result.scalar_one_or_none()
+            if user.subscription:
+                for key, value in values.items():
+                    setattr(user.subscription, key, value)
+            else:
+                user.subscription = Subscription(user_id=user_id, **values)
 
-            if not usage:
-                usage = SubscriptionUsage(
+            # Update user subscription tier
+            user.subscription_tier = tier
+
+            # Create usage tracking if missing
+            if not user.usage:
+                user.usage = SubscriptionUsage(
                     user_id=user_id,
                     trips_created_this_month=0,
                     api_calls_this_month=0,
                     period_start=datetime.utcnow(),
                     period_end=datetime.utcnow() + timedelta(days=30)
                 )
-                db.add(usage)
 
             await db.commit()
             logger.info(f"Subscription created/updated for user {user_id}")
@@ -223,14 +216,14 @@ class StripeService:
 
     @staticmethod
     async def handle_subscription_updated(
-        subscription_data: Dict[str, Any],
+        subscription_data: SubscriptionEvent,
         db: AsyncSession
     ):
         """
         Handle subscription update events
         """
         try:
-            subscription_id = subscription_data['id']
+            subscription_id = subscription_data.id
 
             result = await db.execute(
                 select(Subscription).where(Subscription.stripe_subscription_id == subscription_id)
@@ -238,13 +231,13 @@ class StripeService:
             subscription = result.scalar_one_or_none()
 
             if subscription:
-                subscription.status = subscription_data['status']
-                subscription.current_period_start = datetime.fromtimestamp(subscription_data['current_period_start'])
-                subscription.current_period_end = datetime.fromtimestamp(subscription_data['current_period_end'])
-                subscription.cancel_at_period_end = subscription_data.get('cancel_at_period_end', False)
+                subscription.status = subscription_data.status
+                subscription.current_period_start = _ts(subscription_data.current_period_start)
+                subscription.current_period_end = _ts(subscription_data.current_period_end)
+                subscription.cancel_at_period_end = subscription_data.cancel_at_period_end
 
-                if subscription_data.get('canceled_at'):
-                    subscription.canceled_at = datetime.fromtimestamp(subscription_data['canceled_at'])
+                if subscription_data.canceled_at:
+                    subscription.canceled_at = _ts(subscription_data.canceled_at)
 
                 # Update user tier if subscription cancelled
                 if subscription.status in ['canceled', 'unpaid']:
@@ -264,14 +257,14 @@ class StripeService:
 
     @staticmethod
     async def handle_invoice_paid(
-        invoice_data: Dict[str, Any],
+        invoice_data: InvoiceEvent,
         db: AsyncSession
     ):
         """
         Handle successful invoice payment
         """
         try:
-            customer_id = invoice_data['customer']
+            customer_id = invoice_data.customer
 
             # Find user by Stripe customer ID
             result = await db.execute(
@@ -282,14 +275,14 @@ class StripeService:
             if user:
                 payment = PaymentHistory(
                     user_id=user.id,
-                    stripe_invoice_id=invoice_data['id'],
-                    stripe_payment_intent_id=invoice_data.get('payment_intent'),
-                    amount=invoice_data['amount_paid'] / 100,  # Convert from cents
-                    currency=invoice_data['currency'].upper(),
+                    stripe_invoice_id=invoice_data.id,
+                    stripe_payment_intent_id=invoice_data.payment_intent,
+                    amount=invoice_data.amount_paid / 100,  # Convert from cents
+                    currency=invoice_data.currency.upper(),
                     status='paid',
-                    description=invoice_data.get('description', 'Subscription payment'),
-                    invoice_pdf_url=invoice_data.get('invoice_pdf'),
-                    payment_date=datetime.fromtimestamp(invoice_data['status_transitions']['paid_at'])
+                    description=invoice_data.description,
+                    invoice_pdf_url=invoice_data.invoice_pdf,
+                    payment_date=_ts(invoice_data.status_transitions.paid_at)
                 )
                 db.add(payment)
                 await db.commit()
@@ -357,9 +350,11 @@ class StripeService:
         Check if user has exceeded their usage limits
         """
         try:
-            # Get user's subscription
+            # Get user together with their usage record
             user_result = await db.execute(
-                select(User).where(User.id == user_id)
+                select(User)
+                .options(joinedload(User.usage))
+                .where(User.id == user_id)
             )
             user = user_result.scalar_one_or_none()
 
@@ -369,11 +364,7 @@ class StripeService:
             tier = user.subscription_tier
             tier_info = StripeService.TIER_PRICES.get(tier, StripeService.TIER_PRICES['free'])
 
-            # Get usage
-            usage_result = await db.execute(
-                select(SubscriptionUsage).where(SubscriptionUsage.user_id == user_id)
-            )
-            usage = usage_result.scalar_one_or_none()
+            usage = user.usage
 
             if not usage:
                 # Create usage record if doesn't exist
@@ -384,7 +375,7 @@ class StripeService:
                     period_start=datetime.utcnow(),
                     period_end=datetime.utcnow() + timedelta(days=30)
                 )
-                db.add(usage)
+                user.usage = usage
                 await db.commit()
 
             # Check if period needs reset
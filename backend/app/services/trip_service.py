@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from geopy.distance import geodesic
+import numpy as np
 import logging
 
 from app.models import Trip, TripStatus, Location, LocationType
@@ -113,53 +114,72 @@ class TripPlanningService:
                 limit=50,
             )
 
-            # Get personalized recommendations from those locations
-            candidates = []
-            for item in locations_along_route:
-                location = item["location"]
-
-                # Calculate score based on:
-                # - User preferences (via recommendation service)
-                # - Distance from route (prefer closer)
-                # - Location rating
-                # - Distribution along route
-
-                distance_score = 1.0 / (1.0 + item["distance_from_route_km"])
-                rating_score = (location.rating or 3.0) / 5.0
-
-                # Get position along route (0 = start, 1 = end)
-                dist_from_start = geodesic(
-                    (trip.start_latitude, trip.start_longitude),
-                    (location.latitude, location.longitude)
-                ).kilometers
-                position_ratio = dist_from_start / route_distance if route_distance > 0 else 0
-
-                candidates.append({
-                    "location": location,
-                    "distance_from_route_km": item["distance_from_route_km"],
-                    "distance_from_start_km": dist_from_start,
-                    "position_ratio": position_ratio,
-                    "distance_score": distance_score,
-                    "rating_score": rating_score,
-                    "combined_score": 0.5 * distance_score + 0.5 * rating_score,
-                })
+            if not locations_along_route:
+                return []
+
+            # Score candidates as parallel arrays (one entry per location)
+            # rather than one dict per location; dicts are only built for
+            # the stops that are actually returned.
+            n = len(locations_along_route)
+            locations = [item["location"] for item in locations_along_route]
+            distance_from_route = np.fromiter(
+                (item["distance_from_route_km"] for item in locations_along_route),
+                dtype=np.float64,
+                count=n,
+            )
+            rating = np.fromiter(
+                (location.rating or 3.0 for location in locations),
+                dtype=np.float64,
+                count=n,
+            )
+            # Distance from start along the route (0 = start, 1 = end)
+            start_point = (trip.start_latitude, trip.start_longitude)
+            distance_from_start = np.fromiter(
+                (
+                    geodesic(start_point, (location.latitude, location.longitude)).kilometers
+                    for location in locations
+                ),
+                dtype=np.float64,
+                count=n,
+            )
 
-            # Select stops distributed along the route
-            candidates.sort(key=lambda x: x["combined_score"], reverse=True)
+            # Calculate score based on:
+            # - Distance from route (prefer closer)
+            # - Location rating
+            distance_score = 1.0 / (1.0 + distance_from_route)
+            rating_score = rating / 5.0
+            combined_score = 0.5 * distance_score + 0.5 * rating_score
+            if route_distance > 0:
+                position_ratio = distance_from_start / route_distance
+            else:
+                position_ratio = np.zeros(n)
+
+            # Best-scored first, so ties on position go to the higher score
+            order = np.argsort(-combined_score, kind="stable")
+            ordered_positions = position_ratio[order]
+            available = np.ones(n, dtype=bool)
 
             # Ensure good distribution - divide route into segments
             suggestions = []
-            for i in range(num_stops):
+            for i in range(min(num_stops, n)):
                 target_position = (i + 1) / (num_stops + 1)  # Evenly space stops
 
-                # Find best location near this position
-                best = min(
-                    candidates,
-                    key=lambda x: abs(x["position_ratio"] - target_position)
-                )
+                # Find best remaining location near this position
+                offsets = np.abs(ordered_positions - target_position)
+                offsets[~available] = np.inf
+                best = int(np.argmin(offsets))
+                available[best] = False  # Don't suggest same location twice
 
-                suggestions.append(best)
-                candidates.remove(best)  # Don't suggest same location twice
+                idx = order[best]
+                suggestions.append({
+                    "location": locations[idx],
+                    "distance_from_route_km": float(distance_from_route[idx]),
+                    "distance_from_start_km": float(distance_from_start[idx]),
+                    "position_ratio": float(position_ratio[idx]),
+                    "distance_score": float(distance_score[idx]),
+                    "rating_score": float(rating_score[idx]),
+                    "combined_score": float(combined_score[idx]),
+                })
 
             return suggestions
 
@@ -1,13 +1,48 @@
 from abc import ABC, abstractmethod
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from sqlalchemy import Boolean, Float, bindparam, delete, func, inspect, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from operator import itemgetter
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def parse_event_datetime(value: Any, tz_name: Optional[str] = None) -> Optional[datetime]:
+    """
+    Parse an event date from a source row into a naive UTC datetime.
+
+    Accepts datetimes, dates and ISO-8601 strings (with or without a
+    UTC offset or trailing 'Z'). Values without an offset are taken as
+    UTC, or as wall-clock time in the IANA time zone tz_name when given.
+    Returns None for empty or unparseable values and unknown time zones.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            logger.warning(f"Unparseable event date: {value!r}")
+            return None
+    elif not isinstance(value, datetime) and isinstance(value, date):
+        value = datetime(value.year, value.month, value.day)
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None and tz_name:
+        try:
+            value = value.replace(tzinfo=ZoneInfo(tz_name))
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning(f"Unknown event time zone: {tz_name!r}")
+            return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 class BaseImporter(ABC):
     """
     Abstract base class for importing data from source databases.
@@ -22,12 +57,23 @@ class BaseImporter(ABC):
 
         Args:
             source_engine: SQLAlchemy engine for the source database
-            target_session: SQLAlchemy session for the target (TripFlow) database
+            target_session: SQLAlchemy session for the target (TripFlow) database.
+                Must be bound to PostgreSQL: batches are written with
+                INSERT ... ON CONFLICT, and rely on the psycopg2 executemany
+                mode configured on the engine in app.db.database.
         """
+        dialect = target_session.get_bind().dialect.name
+        if dialect != "postgresql":
+            raise ValueError(f"Importers require a PostgreSQL target database, got: {dialect}")
+
         self.source_engine = source_engine
         self.target_session = target_session
         self.source_name = self.get_source_name()
 
+        # (external_id, source) -> canonical_location_id, or None if unmapped.
+        # Mappings only change during deduplication runs, not during an import.
+        self._mapping_cache: Dict[Tuple[str, str], Optional[int]] = {}
+
     @abstractmethod
     def get_source_name(self) -> str:
         """Return the source name (e.g., 'park4night', 'campercontact')"""
@@ -40,6 +86,8 @@ class BaseImporter(ABC):
 
         This query should select all relevant fields from the source database.
         The query result should be convertible to Location model.
+        Rows may come back in any order; leave out ORDER BY so the source
+        can stream a plain sequential scan.
         """
         pass
 
@@ -56,6 +104,30 @@ class BaseImporter(ABC):
         """
         pass
 
+    def transform_batch(self, rows: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Transform a batch of source rows in a single pass.
+
+        Rows that fail to transform are logged and left out, so the
+        number of failures is len(rows) minus the length of the result.
+        Importers may override this for batch-level work.
+
+        Args:
+            rows: Source rows of one batch
+
+        Returns:
+            List of (source row, transformed Location data) pairs
+        """
+        transform_row = self.transform_row
+        transformed = []
+        append = transformed.append
+        for row in rows:
+            try:
+                append((row, transform_row(row)))
+            except Exception as e:
+                logger.error(f"Error processing row: {e}")
+        return transformed
+
     def get_translations(self, row: Dict[str, Any]) -> Optional[Dict[str, str]]:
         """
         Extract multilingual translations from a source row (optional).
@@ -74,33 +146,66 @@ class BaseImporter(ABC):
         """
         return None
 
-    def fetch_source_data(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def iter_source_batches(
+        self, batch_size: int = 1000, limit: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Fetch data from source database.
+        Stream data from source database in batches.
+
+        Uses a server-side cursor, so only one batch of rows is held in
+        memory at a time.
 
         Args:
+            batch_size: Number of rows per yielded batch
             limit: Optional limit on number of rows to fetch
 
-        Returns:
-            List of dictionaries representing source rows
+        Yields:
+            Lists of dictionaries representing source rows
         """
         query = self.get_source_query()
         if limit:
             query += f" LIMIT {limit}"
 
-        logger.info(f"Fetching data from {self.source_name}...")
+        logger.info(f"Streaming data from {self.source_name}...")
 
         with self.source_engine.connect() as conn:
-            result = conn.execute(text(query))
-            rows = [dict(row._mapping) for row in result]
+            result = conn.execution_options(
+                stream_results=True, yield_per=batch_size
+            ).execute(text(query))
+            for partition in result.partitions(batch_size):
+                yield [dict(row._mapping) for row in partition]
 
-        logger.info(f"Fetched {len(rows)} rows from {self.source_name}")
-        return rows
+    def fetch_source_data(self, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream rows from source database one at a time.
+
+        Rows come from the same server-side cursor as iter_source_batches(),
+        so the full result set is never held in memory.
+
+        Args:
+            limit: Optional limit on number of rows to fetch
 
-    def import_data(self, batch_size: int = 100, limit: Optional[int] = None) -> Dict[str, int]:
+        Yields:
+            Dictionaries representing source rows
+        """
+        count = 0
+        for batch in self.iter_source_batches(batch_size=1000, limit=limit):
+            count += len(batch)
+            yield from batch
+
+        logger.info(f"Fetched {count} rows from {self.source_name}")
+
+    def import_data(self, batch_size: int = 1000, limit: Optional[int] = None) -> Dict[str, int]:
         """
         Import data from source database to TripFlow database.
 
+        Each batch is written with a single INSERT ... ON CONFLICT
+        (external_id, source) DO UPDATE statement. Rows mapped to a
+        canonical location (after deduplication) update that location instead.
+
+        The whole import runs in one transaction with a SAVEPOINT per
+        batch, so a failing batch is skipped without losing earlier ones.
+
         Args:
             batch_size: Number of records to process in each batch
             limit: Optional limit on total records to import
@@ -108,7 +213,8 @@ class BaseImporter(ABC):
         Returns:
             Dictionary with import statistics
         """
-        from app.models import Location, LocationSource, LocationTranslation
+        from app.models import Location, LocationSource
+        from app.models.translation import LocationTranslation
 
         stats = {
             "fetched": 0,
@@ -120,94 +226,210 @@ class BaseImporter(ABC):
             "mapped_to_canonical": 0,
         }
 
+        # Location attribute name -> table column name (e.g. active -> is_active)
+        column_names = {
+            attr.key: attr.columns[0].name
+            for attr in inspect(Location).column_attrs
+        }
+
+        # Location data keys -> (column names, getter for their values)
+        column_plans = {}
+
+        # Constant for the whole import; resolve once instead of per row
+        session = self.target_session
+
         try:
-            # Fetch source data
-            source_rows = self.fetch_source_data(limit=limit)
-            stats["fetched"] = len(source_rows)
+            source = LocationSource[self.source_name.upper()].value
+
+            # Stream source data in batches
+            batches = self.iter_source_batches(batch_size=batch_size, limit=limit)
+            for batch_number, batch in enumerate(batches, start=1):
+                stats["fetched"] += len(batch)
+                logger.info(f"Processing batch {batch_number} ({len(batch)} rows)")
+
+                # Transform to Location format
+                transformed = self.transform_batch(batch)
+                stats["errors"] += len(batch) - len(transformed)
+
+                # Look up canonical mappings for the whole batch at once
+                mappings = self._get_source_mappings(
+                    [location_data.get("external_id") for _, location_data in transformed],
+                    source,
+                )
+                synced_at = datetime.utcnow()
 
-            # Process in batches
-            for i in range(0, len(source_rows), batch_size):
-                batch = source_rows[i:i + batch_size]
-                logger.info(f"Processing batch {i // batch_size + 1} ({len(batch)} rows)")
+                # Keyed by external_id: a row may only be upserted once per statement
+                pending = {}
+                touched_mappings = []
 
-                for row in batch:
+                for row, location_data in transformed:
                     try:
-                        # Transform row to Location format
-                        location_data = self.transform_row(row)
                         external_id = location_data.get("external_id")
-                        source_enum = LocationSource[self.source_name.upper()]
 
                         # Check if this external_id is mapped to an existing canonical location
-                        existing_mapping = self._get_source_mapping(external_id, source_enum.value)
+                        canonical_id = mappings.get(external_id)
 
-                        if existing_mapping:
+                        if canonical_id:
                             # Update the canonical location with new data from this source
-                            canonical_id = existing_mapping['canonical_location_id']
-                            self._update_canonical_from_source(canonical_id, location_data)
+                            if self._update_canonical_from_source(canonical_id, location_data):
+                                touched_mappings.append(external_id)
                             stats["mapped_to_canonical"] += 1
                             continue
 
-                        # Check if location already exists as its own record
-                        existing = self.target_session.query(Location).filter(
-                            Location.external_id == external_id,
-                            Location.source == source_enum
-                        ).first()
-
-                        if existing:
-                            # Update existing location
-                            for key, value in location_data.items():
-                                setattr(existing, key, value)
-                            existing.last_synced_at = datetime.utcnow()
-                            location_obj = existing
-                            stats["updated"] += 1
-                        else:
-                            # Insert new location
-                            location_data["source"] = source_enum
-                            location_data["last_synced_at"] = datetime.utcnow()
-                            location_obj = Location(**location_data)
-                            self.target_session.add(location_obj)
-                            stats["inserted"] += 1
-
-                        # Flush to get location ID for translations
-                        self.target_session.flush()
-
-                        # Handle translations if available
-                        translations = self.get_translations(row)
-                        if translations and location_obj.id:
-                            # Delete existing translations for this location
-                            self.target_session.query(LocationTranslation).filter(
-                                LocationTranslation.location_id == location_obj.id
-                            ).delete()
-
-                            # Insert new translations
-                            for lang_code, description in translations.items():
-                                if description and description.strip():
-                                    translation = LocationTranslation(
-                                        location_id=location_obj.id,
-                                        language_code=lang_code,
-                                        description=description.strip()
-                                    )
-                                    self.target_session.add(translation)
-                                    stats["translations"] += 1
+                        # Locations need coordinates; one bad row would fail the whole batch
+                        if location_data.get("latitude") is None or location_data.get("longitude") is None:
+                            stats["skipped"] += 1
+                            continue
+
+                        location_data["source"] = source
+                        location_data["last_synced_at"] = synced_at
+
+                        # An importer returns the same keys for every row, so
+                        # which keys are columns is only worked out once
+                        data_keys = tuple(location_data)
+                        plan = column_plans.get(data_keys)
+                        if plan is None:
+                            keys = [key for key in data_keys if key in column_names]
+                            plan = column_plans[data_keys] = (
+                                [column_names[key] for key in keys],
+                                itemgetter(*keys),
+                            )
+                        columns, get_values = plan
+                        pending[external_id] = (dict(zip(columns, get_values(location_data))), row)
 
                     except Exception as e:
                         logger.error(f"Error processing row: {e}")
                         stats["errors"] += 1
                         continue
 
-                # Commit batch
-                self.target_session.commit()
-                logger.info(f"Batch committed: {stats['inserted']} inserted, {stats['updated']} updated")
+                if pending:
+                    batch_stats = {"inserted": 0, "updated": 0, "translations": 0}
+                    try:
+                        # SAVEPOINT: a failing batch is rolled back on its own
+                        with session.begin_nested():
+                            location_ids = self._upsert_locations(
+                                [values for values, _ in pending.values()], batch_stats
+                            )
+
+                            # Handle translations if available
+                            translation_rows = []
+                            translated_ids = []
+                            for external_id, (_, row) in pending.items():
+                                translations = self.get_translations(row)
+                                location_id = location_ids.get(external_id)
+                                if not translations or not location_id:
+                                    continue
+
+                                translated_ids.append(location_id)
+                                translation_rows.extend(
+                                    {
+                                        "location_id": location_id,
+                                        "language_code": lang_code,
+                                        "description": description.strip(),
+                                    }
+                                    for lang_code, description in translations.items()
+                                    if description and description.strip()
+                                )
+
+                            if translated_ids:
+                                # Replace existing translations for these locations
+                                session.execute(
+                                    delete(LocationTranslation).where(
+                                        LocationTranslation.location_id.in_(translated_ids)
+                                    )
+                                )
+                            if translation_rows:
+                                session.execute(LocationTranslation.__table__.insert(), translation_rows)
+                                batch_stats["translations"] = len(translation_rows)
+
+                    except Exception as e:
+                        logger.error(f"Error upserting batch {batch_number}: {e}")
+                        stats["errors"] += len(pending)
+                    else:
+                        for key, count in batch_stats.items():
+                            stats[key] += count
+
+                # Write canonical updates; the import commits once at the end.
+                # Upserted locations never enter the identity map, so there is
+                # nothing to flush unless canonical locations were modified.
+                if touched_mappings:
+                    self._touch_source_mappings(touched_mappings, source)
+                    session.flush()
+                logger.info(f"Batch written: {stats['inserted']} inserted, {stats['updated']} updated")
+
+            session.commit()
 
         except Exception as e:
             logger.error(f"Error during import from {self.source_name}: {e}")
-            self.target_session.rollback()
+            session.rollback()
             raise
 
         logger.info(f"Import from {self.source_name} complete: {stats}")
         return stats
 
-    def sync(self, batch_size: int = 100, limit: Optional[int] = None) -> Dict[str, int]:
+    def _upsert_locations(self, rows: List[Dict[str, Any]], stats: Dict[str, int]) -> Dict[str, int]:
+        """
+        Insert or update a batch of locations in one statement.
+
+        This is a Core statement on the locations table: no Location
+        objects are created and nothing enters the session's identity map.
+        The rows are passed as executemany parameters, so the statement
+        compiles once per import and psycopg2 sends them as multi-row
+        VALUES pages (insertmanyvalues) with RETURNING.
+
+        Args:
+            rows: Location values keyed by column name, unique per external_id.
+                All rows must have the same keys, including latitude and
+                longitude; geom is computed from them.
+            stats: Import statistics, updated with inserted/updated counts
+
+        Returns:
+            Dict mapping external_id to location ID
+        """
+        from app.models import Location
+
+        loc_table = Location.__table__
+
+        # geom is built by PostGIS from the row's coordinates. Column names
+        # can't double as bind names in an INSERT, so pass them again.
+        for row in rows:
+            row["geom_longitude"] = row["longitude"]
+            row["geom_latitude"] = row["latitude"]
+        stmt = pg_insert(loc_table).values(
+            geom=func.ST_SetSRID(
+                func.ST_MakePoint(
+                    bindparam("geom_longitude", type_=Float),
+                    bindparam("geom_latitude", type_=Float),
+                ),
+                4326,
+            )
+        )
+
+        # Only overwrite columns the importer provides, so deduplication
+        # fields (is_canonical, canonical_id, ...) survive a re-sync
+        provided = set(rows[0]) | {"geom", "updated_at"}
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["external_id", "source"],
+            set_={
+                column.name: column
+                for column in stmt.excluded
+                if column.name in provided and column.name not in ("id", "created_at")
+            },
+        ).returning(
+            loc_table.c.id,
+            loc_table.c.external_id,
+            # xmax is 0 only for freshly inserted tuples
+            literal_column("xmax = 0", Boolean).label("inserted"),
+        )
+
+        location_ids = {}
+        for location_id, external_id, inserted in self.target_session.execute(stmt, rows).fetchall():
+            location_ids[external_id] = location_id
+            stats["inserted" if inserted else "updated"] += 1
+
+        return location_ids
+
+    def sync(self, batch_size: int = 1000, limit: Optional[int] = None) -> Dict[str, int]:
         """
         Alias for import_data - performs sync operation.
 
@@ -215,30 +437,42 @@ class BaseImporter(ABC):
         """
         return self.import_data(batch_size=batch_size, limit=limit)
 
-    def _get_source_mapping(self, external_id: str, source: str) -> Optional[Dict[str, Any]]:
+    def _get_source_mappings(self, external_ids: List[str], source: str) -> Dict[str, int]:
         """
-        Check if an external_id is already mapped to a canonical location.
+        Find which external_ids are already mapped to a canonical location.
 
         This happens when a location was previously merged into another.
+        Results are cached for the lifetime of the importer.
 
         Args:
-            external_id: The external ID from the source
+            external_ids: External IDs from the source
             source: The source name (e.g., 'park4night')
 
         Returns:
-            Dict with canonical_location_id if mapping exists, None otherwise
+            Dict mapping external_id to canonical_location_id for mapped IDs
         """
-        result = self.target_session.execute(text("""
-            SELECT canonical_location_id
-            FROM tripflow.location_source_mappings
-            WHERE external_id = :ext_id AND source = :src
-        """), {'ext_id': external_id, 'src': source}).fetchone()
-
-        if result:
-            return {'canonical_location_id': result[0]}
-        return None
-
-    def _update_canonical_from_source(self, canonical_id: int, location_data: Dict[str, Any]):
+        cache = self._mapping_cache
+        missing = [ext_id for ext_id in external_ids if (ext_id, source) not in cache]
+
+        if missing:
+            result = self.target_session.execute(text("""
+                SELECT external_id, canonical_location_id
+                FROM tripflow.location_source_mappings
+                WHERE source = :src AND external_id = ANY(:ext_ids)
+            """), {'ext_ids': missing, 'src': source})
+
+            # Remember misses too, so unmapped IDs aren't queried again
+            cache.update(((ext_id, source), None) for ext_id in missing)
+            cache.update(((ext_id, source), canonical_id) for ext_id, canonical_id in result)
+
+        mappings = {}
+        for ext_id in external_ids:
+            canonical_id = cache[(ext_id, source)]
+            if canonical_id is not None:
+                mappings[ext_id] = canonical_id
+        return mappings
+
+    def _update_canonical_from_source(self, canonical_id: int, location_data: Dict[str, Any]) -> bool:
         """
         Update a canonical location with new data from a merged source.
 
@@ -246,16 +480,22 @@ class BaseImporter(ABC):
         another location. We update fields that might have changed (ratings, etc.)
         but don't overwrite core data like name/description.
 
+        The mapping's last_synced_at is not touched here; import_data
+        updates it for the whole batch in one statement.
+
         Args:
             canonical_id: ID of the canonical location
             location_data: New data from the source
+
+        Returns:
+            True if the canonical location exists and was updated
         """
         from app.models import Location
 
         canonical = self.target_session.query(Location).filter(Location.id == canonical_id).first()
         if not canonical:
             logger.warning(f"Canonical location {canonical_id} not found")
-            return
+            return False
 
         # Update rating if the source has newer/better data
         if location_data.get('rating') and location_data.get('rating_count'):
@@ -275,26 +515,36 @@ class BaseImporter(ABC):
                 canonical.rating = source_rating
                 canonical.rating_count = source_count
 
-        # Update images if source has new ones
-        if location_data.get('images'):
-            def get_url(img):
-                return img.get('url') if isinstance(img, dict) else img
+        # Update images if source has new ones (images are URL strings or {"url": ...} dicts)
+        source_images = location_data.get('images')
+        if source_images:
+            images = canonical.images or []
+            existing_urls = frozenset(
+                img.get('url') if type(img) is dict else img for img in images
+            )
+            new_images = [
+                img for img in source_images
+                if (img.get('url') if type(img) is dict else img) not in existing_urls
+            ]
+            if new_images:
+                canonical.images = (images + new_images)[:20]
 
-            existing_urls = {get_url(img) for img in (canonical.images or [])}
-            new_images = [img for img in location_data['images'] if get_url(img) not in existing_urls]
-            if new_images and canonical.images:
-                canonical.images = (canonical.images + new_images)[:20]
-            elif new_images:
-                canonical.images = new_images[:20]
+        logger.debug(f"Updated canonical location {canonical_id} from source {self.source_name}")
+        return True
+
+    def _touch_source_mappings(self, external_ids: List[str], source: str):
+        """
+        Mark source mappings as synced.
+
+        Args:
+            external_ids: External IDs whose canonical location was updated
+            source: The source name (e.g., 'park4night')
+        """
+        if not external_ids:
+            return
 
-        # Update the source mapping timestamp
         self.target_session.execute(text("""
             UPDATE tripflow.location_source_mappings
             SET last_synced_at = NOW()
-            WHERE external_id = :ext_id AND source = :src
-        """), {
-            'ext_id': location_data.get('external_id'),
-            'src': self.source_name
-        })
-
-        logger.debug(f"Updated canonical location {canonical_id} from source {self.source_name}")
+            WHERE source = :src AND external_id = ANY(:ext_ids)
+        """), {'ext_ids': external_ids, 'src': source})
@@ -2,10 +2,19 @@ from typing import Dict, Any, Optional
 from .base_importer import BaseImporter
 from app.models import LocationType
 import logging
-import json
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Map CamperContact type to LocationType
+TYPE_MAPPING = {
+    "camperplace": LocationType.PARKING,
+    "campsite": LocationType.CAMPSITE,
+    "parking": LocationType.PARKING,
+    "motorhome_area": LocationType.SERVICE_AREA,
+    "rest_stop": LocationType.REST_AREA,
+}
+
 
 class CamperContactImporter(BaseImporter):
     """
@@ -38,32 +47,23 @@ class CamperContactImporter(BaseImporter):
             FROM scraper_5.places
             WHERE latitude IS NOT NULL
                 AND longitude IS NOT NULL
-            ORDER BY id
         """
 
     def transform_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
         """
         Transform Scraparr CamperContact row to TripFlow Location format.
         """
-        # Parse raw_data JSON for additional details
-        raw_data = row.get("raw_data", {})
-        if isinstance(raw_data, str):
+        # Parse raw_data JSON for additional details (psycopg2 already
+        # decodes json/jsonb columns, so this only runs for text columns)
+        raw_data = row.get("raw_data") or {}
+        if not isinstance(raw_data, dict):
             try:
-                raw_data = json.loads(raw_data)
-            except:
+                raw_data = orjson.loads(raw_data)
+            except orjson.JSONDecodeError:
                 raw_data = {}
 
-        # Map CamperContact type to LocationType
-        type_mapping = {
-            "camperplace": LocationType.PARKING,
-            "campsite": LocationType.CAMPSITE,
-            "parking": LocationType.PARKING,
-            "motorhome_area": LocationType.SERVICE_AREA,
-            "rest_stop": LocationType.REST_AREA,
-        }
-
         location_type_raw = row.get("type") or raw_data.get("type", "")
-        location_type = type_mapping.get(
+        location_type = TYPE_MAPPING.get(
             location_type_raw.lower() if location_type_raw else "",
             LocationType.PARKING  # default for camper-related
         )
@@ -107,7 +107,6 @@ class CamperContactImporter(BaseImporter):
             "location_type": location_type,
             "latitude": float(row.get("latitude")) if row.get("latitude") else None,
             "longitude": float(row.get("longitude")) if row.get("longitude") else None,
-            "geom": f"POINT({row.get('longitude')} {row.get('latitude')})" if row.get("longitude") and row.get("latitude") else None,
             "address": None,  # Not provided in grid scraper data
             "city": None,  # Not provided in grid scraper data
             "region": None,
@@ -130,7 +129,9 @@ class CamperContactImporter(BaseImporter):
             "tags": tags,
             "active": True,  # All scraped locations assumed active
             "source_url": website,
-            "raw_data": json.dumps({
+            # Stored as a JSONB object; the engine's orjson serializer writes
+            # datetimes and dates as ISO-8601 strings
+            "raw_data": {
                 "poi_id": row.get("poi_id"),
                 "sitecode": row.get("sitecode"),
                 "type": row.get("type"),
@@ -138,7 +139,7 @@ class CamperContactImporter(BaseImporter):
                 "is_claimed": row.get("is_claimed"),
                 "subscription_level": row.get("subscription_level"),
                 "original_raw_data": raw_data,
-                "scraped_at": row.get("scraped_at").isoformat() if row.get("scraped_at") else None,
-                "updated_at": row.get("updated_at").isoformat() if row.get("updated_at") else None,
-            })
+                "scraped_at": row.get("scraped_at"),
+                "updated_at": row.get("updated_at"),
+            }
         }
@@ -1,9 +1,12 @@
-from celery import Celery
-from datetime import datetime, timedelta
-from sqlalchemy import and_, or_, text
+from celery import Celery, chord, group
+from celery.exceptions import SoftTimeLimitExceeded
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.exc import OperationalError
 from app.core.config import settings
 from app.db.database import SessionLocal
-from app.sync.sync_manager import create_sync_manager
+from app.sync.sync_manager import IMPORTERS, create_sync_manager
 from app.models.event import Event
 from app.models.location import Location, LocationType
 import logging
@@ -18,42 +21,87 @@ celery_app = Celery(
 )
 
 # Celery configuration
+# msgpack is a compact binary encoding for task arguments and results;
+# json stays accepted so messages queued by older workers still decode.
+# Task results must stay msgpack-friendly (dates as ISO strings).
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_serializer="msgpack",
+    result_accept_content=["msgpack", "json"],
     timezone="UTC",
     enable_utc=True,
+    # Tasks are acknowledged after they finish (acks_late), so a task whose
+    # worker dies is redelivered. The broker must not redeliver tasks that
+    # are still running: keep the visibility timeout above the longest
+    # task time limit.
+    broker_transport_options={"visibility_timeout": 4 * 3600},
 )
 
+# Generous limits for a full import of one source; they stop stuck syncs
+# (import_data rolls back) instead of letting them hold a connection forever.
+SYNC_SOFT_TIME_LIMIT = 3 * 3600
+SYNC_TIME_LIMIT = SYNC_SOFT_TIME_LIMIT + 600
 
-@celery_app.task(name="sync_all_sources")
-def sync_all_sources_task(batch_size: int = 100, limit: int = None):
+# How long events are kept after they end
+EVENT_RETENTION = timedelta(days=settings.EVENT_CLEANUP_RETENTION_DAYS)
+
+
+@celery_app.task(name="sync_all_sources", bind=True, acks_late=True)
+def sync_all_sources_task(self, batch_size: int = 1000, limit: int = None):
     """
     Celery task to sync all source databases.
 
     This task is scheduled to run periodically (e.g., daily).
+
+    Sources are independent, so each one is synced by its own subtask and
+    they run in parallel across the available workers. This task is
+    replaced by a chord whose callback collects the per-source results, so
+    its result is the same {source: stats} dict as SyncManager.sync_all().
     """
-    logger.info("Starting scheduled sync of all sources")
+    logger.info("Starting scheduled sync of all sources: %s", list(IMPORTERS))
 
-    db = SessionLocal()
-    try:
-        sync_manager = create_sync_manager(db)
-        results = sync_manager.sync_all(batch_size=batch_size, limit=limit)
+    header = group(
+        sync_source_or_error_task.s(source_name, batch_size, limit)
+        for source_name in IMPORTERS
+    )
+    return self.replace(chord(header, collect_sync_results_task.s()))
 
-        logger.info(f"Scheduled sync completed: {results}")
-        return results
 
+@celery_app.task(
+    name="sync_source_or_error",
+    acks_late=True,
+    soft_time_limit=SYNC_SOFT_TIME_LIMIT,
+    time_limit=SYNC_TIME_LIMIT,
+)
+def sync_source_or_error_task(source_name: str, batch_size: int = 1000, limit: int = None):
+    """
+    Sync one source as part of sync_all_sources.
+
+    Failures are returned instead of raised (like SyncManager.sync_all), so
+    one failing source doesn't cancel the chord callback for the others.
+    """
+    try:
+        return sync_source_task(source_name, batch_size=batch_size, limit=limit)
     except Exception as e:
-        logger.error(f"Scheduled sync failed: {e}")
-        raise
+        return {"source": source_name, "error": str(e), "success": False}
 
-    finally:
-        db.close()
 
+@celery_app.task(name="collect_sync_results")
+def collect_sync_results_task(results: list):
+    """Chord callback of sync_all_sources: key per-source results by source name"""
+    results = {result["source"]: result for result in results}
+    logger.info("Scheduled sync completed: %s", results)
+    return results
 
-@celery_app.task(name="sync_source")
-def sync_source_task(source_name: str, batch_size: int = 100, limit: int = None):
+
+@celery_app.task(
+    name="sync_source",
+    acks_late=True,
+    soft_time_limit=SYNC_SOFT_TIME_LIMIT,
+    time_limit=SYNC_TIME_LIMIT,
+)
+def sync_source_task(source_name: str, batch_size: int = 1000, limit: int = None):
     """
     Celery task to sync a specific source database.
 
@@ -62,36 +110,41 @@ def sync_source_task(source_name: str, batch_size: int = 100, limit: int = None)
         batch_size: Batch size for processing
         limit: Optional limit for testing
     """
-    logger.info(f"Starting scheduled sync of {source_name}")
+    logger.info("Starting scheduled sync of %s", source_name)
 
-    db = SessionLocal()
     try:
-        sync_manager = create_sync_manager(db)
-        results = sync_manager.sync_source(
-            source_name=source_name,
-            batch_size=batch_size,
-            limit=limit
-        )
+        with SessionLocal() as db:
+            sync_manager = create_sync_manager(db)
+            results = sync_manager.sync_source(
+                source_name=source_name,
+                batch_size=batch_size,
+                limit=limit
+            )
 
-        logger.info(f"Scheduled sync of {source_name} completed: {results}")
+        logger.info("Scheduled sync of %s completed: %s", source_name, results)
         return results
 
     except Exception as e:
-        logger.error(f"Scheduled sync of {source_name} failed: {e}")
+        logger.error("Scheduled sync of %s failed: %s", source_name, e)
         raise
 
-    finally:
-        db.close()
 
-
-@celery_app.task(name="cleanup_expired_events")
+@celery_app.task(
+    name="cleanup_expired_events",
+    acks_late=True,
+    soft_time_limit=1500,
+    time_limit=1800,
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    retry_kwargs={"max_retries": 3},
+)
 def cleanup_expired_events_task():
     """
     Celery task to permanently delete expired events.
 
     Deletes:
     1. Events from the Event model where end_datetime (or start_datetime if no end) has passed
-    2. Locations with location_type=EVENT where raw_data end_date (or start_date) has passed
+    2. Locations with location_type=EVENT where event_end_datetime (or event_start_datetime) has passed
 
     This is a hard delete - records are permanently removed from the database.
     UserFavorites are cascade deleted automatically via foreign key constraint.
@@ -102,54 +155,67 @@ def cleanup_expired_events_task():
 
     logger.info("Starting expired event cleanup")
 
-    db = SessionLocal()
+    # Event dates are naive UTC TIMESTAMP columns, so compare in naive UTC
+    cutoff_date = datetime.now(timezone.utc).replace(tzinfo=None) - EVENT_RETENTION
+    batch_size = settings.EVENT_CLEANUP_BATCH_SIZE
+
+    # Track deletion counts (kept when the run is cut short)
+    deleted_events = 0
+    deleted_locations = 0
+
     try:
-        cutoff_date = datetime.utcnow() - timedelta(days=settings.EVENT_CLEANUP_RETENTION_DAYS)
 
-        # Track deletion counts
-        deleted_events = 0
-        deleted_locations = 0
+        # Both deletes run in chunks of batch_size rows, each in its own short
+        # transaction, so locks (including cascaded favorites) are only held
+        # briefly and the connection goes back to the pool between chunks
 
         # 1. Delete from Event model
         # Events are expired if:
         # - end_datetime exists and is before cutoff, OR
         # - end_datetime is NULL and start_datetime is before cutoff
-        expired_events = db.query(Event).filter(
-            or_(
-                and_(Event.end_datetime.isnot(None), Event.end_datetime < cutoff_date),
-                and_(Event.end_datetime.is_(None), Event.start_datetime < cutoff_date)
+        # Deleted on the server; no Event objects are loaded
+        expired_event_ids = (
+            select(Event.id)
+            .where(
+                or_(
+                    and_(Event.end_datetime.isnot(None), Event.end_datetime < cutoff_date),
+                    and_(Event.end_datetime.is_(None), Event.start_datetime < cutoff_date)
+                )
             )
-        ).all()
+            .order_by(Event.id)
+            .limit(batch_size)
+        )
+        expired_events_query = delete(Event).where(Event.id.in_(expired_event_ids))
 
-        deleted_events = len(expired_events)
-        for event in expired_events:
-            db.delete(event)
+        for rowcount in _delete_in_batches(expired_events_query, batch_size):
+            deleted_events += rowcount
 
         # 2. Delete from Location model (event type only)
-        # Need to handle JSONB raw_data with start_date/end_date
-        # Using raw SQL for JSONB date comparison
-        expired_locations_query = text("""
-            DELETE FROM tripflow.locations
-            WHERE location_type = 'EVENT'
-            AND (
-                (raw_data->>'end_date' IS NOT NULL
-                 AND (raw_data->>'end_date')::timestamp < :cutoff_date)
-                OR
-                (raw_data->>'end_date' IS NULL
-                 AND raw_data->>'start_date' IS NOT NULL
-                 AND (raw_data->>'start_date')::timestamp < :cutoff_date)
+        # Same rule as events, on the promoted event date columns
+        expired_location_ids = (
+            select(Location.id)
+            .where(
+                Location.location_type == LocationType.EVENT.value,
+                or_(
+                    Location.event_end_datetime < cutoff_date,
+                    and_(
+                        Location.event_end_datetime.is_(None),
+                        Location.event_start_datetime < cutoff_date
+                    )
+                )
             )
-        """)
-
-        result = db.execute(expired_locations_query, {"cutoff_date": cutoff_date})
-        deleted_locations = result.rowcount
+            .order_by(Location.id)
+            .limit(batch_size)
+        )
+        expired_locations_query = delete(Location).where(Location.id.in_(expired_location_ids))
 
-        db.commit()
+        for rowcount in _delete_in_batches(expired_locations_query, batch_size):
+            deleted_locations += rowcount
 
         logger.info(
-            f"Expired event cleanup completed: "
-            f"deleted {deleted_events} events, "
-            f"{deleted_locations} event locations"
+            "Expired event cleanup completed: "
+            "deleted %d events, %d event locations",
+            deleted_events, deleted_locations,
         )
 
         return {
@@ -159,13 +225,44 @@ def cleanup_expired_events_task():
             "cutoff_date": cutoff_date.isoformat(),
         }
 
+    except SoftTimeLimitExceeded:
+        # Chunks committed so far stay deleted; the next run picks up the rest
+        logger.warning(
+            "Expired event cleanup hit its time limit after deleting "
+            "%d events, %d event locations",
+            deleted_events, deleted_locations,
+        )
+        return {
+            "status": "time_limit",
+            "deleted_events": deleted_events,
+            "deleted_locations": deleted_locations,
+            "cutoff_date": cutoff_date.isoformat(),
+        }
+
     except Exception as e:
-        db.rollback()
-        logger.error(f"Expired event cleanup failed: {e}")
+        logger.error("Expired event cleanup failed: %s", e)
         raise
 
-    finally:
-        db.close()
+
+def _delete_in_batches(statement, batch_size: int) -> Iterator[int]:
+    """
+    Repeat a DELETE limited to batch_size rows until it runs out of rows.
+
+    Every chunk gets its own session and transaction, committed when the
+    block exits (rolled back on error).
+
+    Yields:
+        Number of rows deleted by each committed chunk
+    """
+    while True:
+        with SessionLocal() as db, db.begin():
+            rowcount = db.execute(
+                statement,
+                execution_options={"synchronize_session": False},
+            ).rowcount
+        yield rowcount
+        if rowcount < batch_size:
+            return
 
 
 # Celery Beat schedule for periodic tasks
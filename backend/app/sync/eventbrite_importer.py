@@ -1,8 +1,7 @@
-from typing import Dict, Any, Optional
-from .base_importer import BaseImporter
+from typing import Dict, Any, Iterator, List, Optional
+from .base_importer import BaseImporter, parse_event_datetime
 from app.models import LocationType
 import logging
-import json
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +40,8 @@ class EventbriteImporter(BaseImporter):
                 updated_at
             FROM scraper_3.events
             WHERE is_online = false  -- Only physical events
-            ORDER BY id
+                AND location IS NOT NULL  -- Nothing to geocode without it
+                AND location <> ''
         """
 
     def transform_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
@@ -55,42 +55,51 @@ class EventbriteImporter(BaseImporter):
         # Extract lat/lon from location field if available (format: "City, Country")
         location_str = row.get("location", "")
 
+        # Fields used more than once below
+        event_id = row.get("event_id")
+        status = row.get("status")
+        venue_name = row.get("venue_name")
+        image_url = row.get("image_url")
+        is_online = row.get("is_online")
+        url = row.get("url")
+
         # Build tags from status and venue
         tags = []
-        if row.get("status"):
-            tags.append(row["status"])
-        if row.get("venue_name"):
-            tags.append(f"Venue: {row['venue_name']}")
+        if status:
+            tags.append(status)
+        if venue_name:
+            tags.append(f"Venue: {venue_name}")
 
         # Handle images
         images = []
         main_image = None
-        if row.get("image_url"):
-            images = [{"url": row["image_url"], "type": "photo"}]
-            main_image = row["image_url"]
+        if image_url:
+            images = [{"url": image_url, "type": "photo"}]
+            main_image = image_url
 
         # Determine amenities
         amenities = []
-        if not row.get("is_online"):
+        if not is_online:
             amenities.append("in-person")
 
         # Create the transformed data
         # NOTE: Eventbrite events without lat/lon will need geocoding
         return {
-            "external_id": f"eventbrite_{row.get('event_id')}",
-            "name": row.get("name") or f"Event {row.get('event_id')}",
+            "external_id": f"eventbrite_{event_id}",
+            "name": row.get("name") or f"Event {event_id}",
             "description": row.get("description"),
             "location_type": LocationType.EVENT,
+            "event_start_datetime": parse_event_datetime(row.get("start_date")),
+            "event_end_datetime": None,
             "latitude": None,  # Need geocoding
             "longitude": None,  # Need geocoding
-            "geom": None,
             "address": location_str,
             "city": row.get("city"),
             "region": None,
             "country": row.get("country"),
             "postal_code": None,
             "amenities": amenities,
-            "features": [row.get("venue_name")] if row.get("venue_name") else [],
+            "features": [venue_name] if venue_name else [],
             "rating": None,
             "review_count": 0,
             "price_type": "unknown",
@@ -100,34 +109,39 @@ class EventbriteImporter(BaseImporter):
             "currency": None,
             "phone": None,
             "email": None,
-            "website": row.get("url"),
+            "website": url,
             "images": images,
             "main_image_url": main_image,
             "tags": tags,
-            "active": row.get("status") == "live",
-            "source_url": row.get("url"),
-            "raw_data": json.dumps({
-                "event_id": row.get("event_id"),
-                "status": row.get("status"),
-                "venue_name": row.get("venue_name"),
-                "is_online": row.get("is_online"),
+            "active": status == "live",
+            "source_url": url,
+            # Stored as a JSONB object; the engine's orjson serializer writes
+            # datetimes as ISO-8601 strings
+            "raw_data": {
+                "event_id": event_id,
+                "status": status,
+                "venue_name": venue_name,
+                "is_online": is_online,
                 "start_date": row.get("start_date"),
                 "country_code": row.get("country_code"),
-                "scraped_at": row.get("scraped_at").isoformat() if row.get("scraped_at") else None,
-                "updated_at": row.get("updated_at").isoformat() if row.get("updated_at") else None,
-            })
+                "scraped_at": row.get("scraped_at"),
+                "updated_at": row.get("updated_at"),
+            }
         }
 
-    def fetch_source_data(self, limit: Optional[int] = None) -> list:
+    def iter_source_batches(
+        self, batch_size: int = 1000, limit: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Override to skip Eventbrite events without coordinates.
+        Override to warn that Eventbrite events have no coordinates.
 
         Note: Eventbrite scraper doesn't capture lat/lon, so these events
-        would need geocoding before being useful in TripFlow.
-        We'll import them but mark them as needing geocoding.
+        would need geocoding before being useful in TripFlow. Until then
+        import_data skips them (no coordinates); the source query already leaves
+        out events without a location string, which can't be geocoded.
         """
         logger.warning(
-            f"Eventbrite events do not have coordinates. "
-            f"Geocoding will be needed before they can be used in TripFlow."
+            "Eventbrite events do not have coordinates. "
+            "Geocoding will be needed before they can be used in TripFlow."
         )
-        return super().fetch_source_data(limit=limit)
+        return super().iter_source_batches(batch_size=batch_size, limit=limit)
@@ -5,6 +5,15 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Map local site type to LocationType
+TYPE_MAPPING = {
+    "campground": LocationType.CAMPSITE,
+    "parking": LocationType.PARKING,
+    "rest_area": LocationType.REST_AREA,
+    "tourist_attraction": LocationType.ATTRACTION,
+    "point_of_interest": LocationType.POI,
+}
+
 
 class LocalSitesImporter(BaseImporter):
     """
@@ -47,7 +56,6 @@ class LocalSitesImporter(BaseImporter):
                 status
             FROM sites
             WHERE status = 'active'
-            ORDER BY id
         """
 
     def transform_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
@@ -56,16 +64,7 @@ class LocalSitesImporter(BaseImporter):
 
         TODO: Customize field mapping based on your actual data structure.
         """
-        # Map local site type to LocationType
-        type_mapping = {
-            "campground": LocationType.CAMPSITE,
-            "parking": LocationType.PARKING,
-            "rest_area": LocationType.REST_AREA,
-            "tourist_attraction": LocationType.ATTRACTION,
-            "point_of_interest": LocationType.POI,
-        }
-
-        location_type = type_mapping.get(
+        location_type = TYPE_MAPPING.get(
             row.get("site_type", "").lower().replace(" ", "_"),
             LocationType.POI  # default
         )
@@ -92,7 +91,6 @@ class LocalSitesImporter(BaseImporter):
             "location_type": location_type,
             "latitude": float(row.get("lat")),
             "longitude": float(row.get("lng")),
-            "geom": f"POINT({row.get('lng')} {row.get('lat')})",
             "address": row.get("full_address"),
             "city": row.get("city"),
             "region": row.get("state"),
@@ -1,11 +1,104 @@
 from typing import Dict, Any, Optional
+from functools import lru_cache
 from .base_importer import BaseImporter
 from app.models import LocationType
 import logging
-import json
+import re
 
 logger = logging.getLogger(__name__)
 
+# Map Park4Night type codes to LocationType
+TYPE_MAPPING = {
+    # Parking types
+    'PJ': LocationType.PARKING,  # Parking jour et nuit
+    'PG': LocationType.PARKING,  # Parking gratuit
+    'PP': LocationType.PARKING,  # Parking payant
+    'PARKING PAYANT JOUR ET NUIT': LocationType.PARKING,
+    'PARKING GRATUIT': LocationType.PARKING,
+    # Service areas
+    'AS': LocationType.SERVICE_AREA,  # Aire de services
+    'AIRE DE SERVICE': LocationType.SERVICE_AREA,
+    'AIRE DE PIQUE-NIQUE': LocationType.REST_AREA,
+    # Camping
+    'CA': LocationType.CAMPSITE,  # Camping
+    'CM': LocationType.CAMPSITE,  # Camping municipal
+    'CP': LocationType.CAMPSITE,  # Camping privé
+    'CAMPING': LocationType.CAMPSITE,
+    'CAMPING MUNICIPAL': LocationType.CAMPSITE,
+    'CAMPING PRIVE': LocationType.CAMPSITE,
+    'CAMPING-CAR PARK': LocationType.PARKING,
+    # Other
+    'FE': LocationType.POI,  # Ferme
+    'FERME': LocationType.POI,
+    'PV': LocationType.ATTRACTION,  # Point de vue
+    'POINT DE VUE': LocationType.ATTRACTION,
+    'LI': LocationType.ATTRACTION,  # Lieu insolite
+    'LIEU INSOLITE': LocationType.ATTRACTION,
+    'ZN': LocationType.POI,  # Zone naturelle
+    'ZONE NATURELLE': LocationType.POI,
+}
+
+@lru_cache(maxsize=64)
+def resolve_location_type(raw_type: str) -> LocationType:
+    """
+    Map a Park4Night type code or name to a LocationType (default: PARKING).
+
+    There are only a few dozen distinct codes, so results are cached.
+    """
+    return TYPE_MAPPING.get(raw_type.upper(), LocationType.PARKING)
+
+
+# Map keys of the services JSON object to amenities
+SERVICE_MAPPING = {
+    'wifi': 'wifi',
+    'internet': 'wifi',
+    'electricity': 'electricity',
+    'electricite': 'electricity',
+    'water': 'water',
+    'eau': 'water',
+    'point_eau': 'water',
+    'waste_disposal': 'waste_disposal',
+    'eau_noire': 'waste_disposal',
+    'toilet': 'toilet',
+    'wc_public': 'toilet',
+    'shower': 'shower',
+    'douche': 'shower',
+    'pets_allowed': 'pets_allowed',
+    'animaux': 'pets_allowed',
+}
+
+# Keywords in service names (services as a list) and the amenity they imply
+SERVICE_KEYWORD_AMENITIES = {
+    'wifi': 'wifi',
+    'internet': 'wifi',
+    'electric': 'electricity',
+    'water': 'water',
+    'eau': 'water',
+    'wc': 'toilet',
+    'toilet': 'toilet',
+    'shower': 'shower',
+    'douche': 'shower',
+}
+# Finds all keywords of a (lowercased) service name in one scan. The
+# lookahead lets matches overlap ('doucheau' has both douche and eau).
+SERVICE_KEYWORD_PATTERN = re.compile('(?=(%s))' % '|'.join(SERVICE_KEYWORD_AMENITIES))
+# Order in which the amenities of one service name are listed
+SERVICE_AMENITIES = ('wifi', 'electricity', 'water', 'toilet', 'shower')
+
+# Keywords in a (lowercased) price text and the price type they imply.
+# Matched as substrings; "don" also covers "donation".
+PRICE_KEYWORD_TYPES = {
+    'gratuit': 'free',
+    'free': 'free',
+    'gratis': 'free',
+    'don': 'donation',
+}
+# Finds all price keywords in one scan
+PRICE_KEYWORD_PATTERN = re.compile('|'.join(PRICE_KEYWORD_TYPES))
+
+# Numbers in free-text prices, e.g. "10 EUR/night" or "12.50"
+PRICE_PATTERN = re.compile(r'\d+\.?\d*')
+
 
 class Park4NightImporter(BaseImporter):
     """
@@ -45,20 +138,20 @@ class Park4NightImporter(BaseImporter):
                 p.nb_comment,
                 p.updated_at,
                 p.scraped_at,
-                -- Aggregate all language descriptions as JSON (en, nl, fr, de, es, it)
+                -- Aggregate all language descriptions as JSONB (en, nl, fr, de, es, it);
+                -- psycopg2 decodes it into a dict
                 COALESCE(
-                    json_object_agg(
+                    jsonb_object_agg(
                         pd.language_code,
                         pd.description
                     ) FILTER (WHERE pd.language_code IS NOT NULL),
-                    '{}'::json
+                    '{}'::jsonb
                 ) as descriptions_json
             FROM scraper_1.places p
             LEFT JOIN scraper_1.place_descriptions pd ON p.id = pd.place_id
             GROUP BY p.id, p.nom, p.latitude, p.longitude, p.pays, p.rating, p.photos,
                      p.description, p.description_en, p.ville, p.prix, p.type, p.services,
                      p.nb_comment, p.updated_at, p.scraped_at
-            ORDER BY p.id
         """
 
     def transform_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
@@ -72,42 +165,8 @@ class Park4NightImporter(BaseImporter):
         - Price parsing
         - Multilingual descriptions (en, nl, fr, de, es, it)
         """
-        # Map Park4Night type codes to LocationType
-        type_mapping = {
-            # Parking types
-            'PJ': LocationType.PARKING,  # Parking jour et nuit
-            'PG': LocationType.PARKING,  # Parking gratuit
-            'PP': LocationType.PARKING,  # Parking payant
-            'PARKING PAYANT JOUR ET NUIT': LocationType.PARKING,
-            'PARKING GRATUIT': LocationType.PARKING,
-            # Service areas
-            'AS': LocationType.SERVICE_AREA,  # Aire de services
-            'AIRE DE SERVICE': LocationType.SERVICE_AREA,
-            'AIRE DE PIQUE-NIQUE': LocationType.REST_AREA,
-            # Camping
-            'CA': LocationType.CAMPSITE,  # Camping
-            'CM': LocationType.CAMPSITE,  # Camping municipal
-            'CP': LocationType.CAMPSITE,  # Camping privé
-            'CAMPING': LocationType.CAMPSITE,
-            'CAMPING MUNICIPAL': LocationType.CAMPSITE,
-            'CAMPING PRIVE': LocationType.CAMPSITE,
-            'CAMPING-CAR PARK': LocationType.PARKING,
-            # Other
-            'FE': LocationType.POI,  # Ferme
-            'FERME': LocationType.POI,
-            'PV': LocationType.ATTRACTION,  # Point de vue
-            'POINT DE VUE': LocationType.ATTRACTION,
-            'LI': LocationType.ATTRACTION,  # Lieu insolite
-            'LIEU INSOLITE': LocationType.ATTRACTION,
-            'ZN': LocationType.POI,  # Zone naturelle
-            'ZONE NATURELLE': LocationType.POI,
-        }
-
-        raw_type = row.get("location_type_raw", "")
-        location_type = type_mapping.get(
-            raw_type.upper() if raw_type else "",
-            LocationType.PARKING  # default
-        )
+        raw_type = row.get("location_type_raw")
+        location_type = resolve_location_type(raw_type or "")
 
         # Build amenities list from services JSON field
         amenities = []
@@ -115,46 +174,24 @@ class Park4NightImporter(BaseImporter):
         if services:
             if isinstance(services, dict):
                 # Services is a JSON object with boolean values
-                service_mapping = {
-                    'wifi': 'wifi',
-                    'internet': 'wifi',
-                    'electricity': 'electricity',
-                    'electricite': 'electricity',
-                    'water': 'water',
-                    'eau': 'water',
-                    'point_eau': 'water',
-                    'waste_disposal': 'waste_disposal',
-                    'eau_noire': 'waste_disposal',
-                    'toilet': 'toilet',
-                    'wc_public': 'toilet',
-                    'shower': 'shower',
-                    'douche': 'shower',
-                    'pets_allowed': 'pets_allowed',
-                    'animaux': 'pets_allowed',
-                }
-                for service_key, amenity_name in service_mapping.items():
-                    if services.get(service_key) and amenity_name not in amenities:
-                        amenities.append(amenity_name)
+                amenities = list(dict.fromkeys(
+                    amenity_name
+                    for service_key, amenity_name in SERVICE_MAPPING.items()
+                    if services.get(service_key)
+                ))
             elif isinstance(services, list):
-                # Services is a list of service names
+                # Services is a list of service names; the found dict dedupes
+                # in first-seen order
+                found = {}
                 for service in services:
                     if isinstance(service, str):
-                        service_lower = service.lower()
-                        if 'wifi' in service_lower or 'internet' in service_lower:
-                            if 'wifi' not in amenities:
-                                amenities.append('wifi')
-                        if 'electric' in service_lower:
-                            if 'electricity' not in amenities:
-                                amenities.append('electricity')
-                        if 'water' in service_lower or 'eau' in service_lower:
-                            if 'water' not in amenities:
-                                amenities.append('water')
-                        if 'wc' in service_lower or 'toilet' in service_lower:
-                            if 'toilet' not in amenities:
-                                amenities.append('toilet')
-                        if 'shower' in service_lower or 'douche' in service_lower:
-                            if 'shower' not in amenities:
-                                amenities.append('shower')
+                        keywords = SERVICE_KEYWORD_PATTERN.findall(service.lower())
+                        if keywords:
+                            matched = {SERVICE_KEYWORD_AMENITIES[keyword] for keyword in keywords}
+                            found.update(
+                                (amenity, None) for amenity in SERVICE_AMENITIES if amenity in matched
+                            )
+                amenities = list(found)
 
         # Handle images - photos is now a JSONB array with link_large/link_thumb
         images = []
@@ -173,8 +210,8 @@ class Park4NightImporter(BaseImporter):
                                 "thumbnail": photo.get("link_thumb"),
                                 "type": "photo"
                             })
-                if images:
-                    main_image = images[0]["url"]
+                            if main_image is None:
+                                main_image = url
             elif isinstance(photos, str):
                 # Legacy format: comma-separated URLs
                 photo_urls = [url.strip() for url in photos.split(',') if url.strip()]
@@ -187,18 +224,23 @@ class Park4NightImporter(BaseImporter):
         price_min = None
         price_max = None
 
-        if row.get("price_info"):
-            price_str = str(row["price_info"]).lower()
-            if 'gratuit' in price_str or 'free' in price_str or 'gratis' in price_str or price_str == '0':
+        price_info = row.get("price_info")
+        if price_info:
+            price_str = str(price_info).lower()
+            # A free keyword wins over a donation keyword anywhere in the text
+            keyword_types = {
+                PRICE_KEYWORD_TYPES[keyword]
+                for keyword in PRICE_KEYWORD_PATTERN.findall(price_str)
+            }
+            if 'free' in keyword_types or price_str == '0':
                 price_type = "free"
                 price_min = 0
                 price_max = 0
-            elif 'donation' in price_str or 'don' in price_str:
+            elif 'donation' in keyword_types:
                 price_type = "donation"
             else:
                 # Try to extract numeric price
-                import re
-                numbers = re.findall(r'\d+\.?\d*', price_str)
+                numbers = PRICE_PATTERN.findall(price_str)
                 if numbers:
                     price_type = "paid"
                     prices = [float(n) for n in numbers]
@@ -211,30 +253,31 @@ class Park4NightImporter(BaseImporter):
 
         # Use English description as primary, fallback to description field
         # Priority: English > French > Dutch > generic description
-        descriptions_json = row.get("descriptions_json", {})
-        if isinstance(descriptions_json, str):
-            try:
-                descriptions_json = json.loads(descriptions_json)
-            except:
-                descriptions_json = {}
+        primary_description = row.get("description_en")
+        if not primary_description:
+            descriptions_json = row.get("descriptions_json") or {}
+            primary_description = (
+                descriptions_json.get("en") or
+                descriptions_json.get("fr") or
+                descriptions_json.get("nl") or
+                row.get("description")
+            )
 
-        primary_description = (
-            row.get("description_en") or
-            descriptions_json.get("en") or
-            descriptions_json.get("fr") or
-            descriptions_json.get("nl") or
-            row.get("description")
-        )
+        # Fields used more than once below
+        place_id = row.get("id")
+        latitude = row.get("latitude")
+        longitude = row.get("longitude")
+        rating = row.get("rating")
+        place_url = f"https://park4night.com/lieu/{place_id}" if place_id else None
 
         # Create the transformed data
         return {
-            "external_id": f"park4night_{row.get('id')}",
-            "name": row.get("name") or f"Park4Night Location {row.get('id')}",
+            "external_id": f"park4night_{place_id}",
+            "name": row.get("name") or f"Park4Night Location {place_id}",
             "description": primary_description,  # Primary description (en > fr > nl > fallback)
             "location_type": location_type,
-            "latitude": float(row.get("latitude")) if row.get("latitude") else None,
-            "longitude": float(row.get("longitude")) if row.get("longitude") else None,
-            "geom": f"POINT({row.get('longitude')} {row.get('latitude')})" if row.get("longitude") and row.get("latitude") else None,
+            "latitude": float(latitude) if latitude else None,
+            "longitude": float(longitude) if longitude else None,
             "address": None,  # Park4Night doesn't provide street address
             "city": row.get("city"),
             "region": None,  # Not provided by Park4Night
@@ -242,30 +285,32 @@ class Park4NightImporter(BaseImporter):
             "postal_code": None,  # Not provided by Park4Night
             "amenities": amenities,
             "features": features,
-            "rating": float(row.get("rating")) if row.get("rating") else None,
+            "rating": float(rating) if rating else None,
             "review_count": row.get("nb_comment") or 0,
             "price_type": price_type,
             "price_min": price_min,
             "price_max": price_max,
-            "price_info": row.get("price_info"),
+            "price_info": price_info,
             "currency": "EUR",
             "phone": None,  # Not provided by Park4Night
             "email": None,  # Not provided by Park4Night
-            "website": f"https://park4night.com/lieu/{row.get('id')}" if row.get("id") else None,
+            "website": place_url,
             "images": images,
             "main_image_url": main_image,
             "tags": tags,
             "active": True,  # Assume all scraped locations are active
-            "source_url": f"https://park4night.com/lieu/{row.get('id')}" if row.get("id") else None,
-            "raw_data": json.dumps({
-                "park4night_id": row.get("id"),
-                "location_type_raw": row.get("location_type_raw"),
-                "services": row.get("services"),
-                "scraped_at": row.get("scraped_at").isoformat() if row.get("scraped_at") else None,
-                "updated_at": row.get("updated_at").isoformat() if row.get("updated_at") else None,
+            "source_url": place_url,
+            # Stored as a JSONB object; the engine's orjson serializer writes
+            # datetimes as ISO-8601 strings
+            "raw_data": {
+                "park4night_id": place_id,
+                "location_type_raw": raw_type,
+                "services": services,
+                "scraped_at": row.get("scraped_at"),
+                "updated_at": row.get("updated_at"),
                 # Note: Multilingual descriptions (en, nl, fr, de, es, it) stored in location_translations table
                 # Note: Photos stored in images field with link_large and link_thumb URLs
-            })
+            }
         }
 
     def get_translations(self, row: Dict[str, Any]) -> Optional[Dict[str, str]]:
@@ -276,12 +321,7 @@ class Park4NightImporter(BaseImporter):
             Dictionary mapping language codes to descriptions:
             {'en': 'English text', 'nl': 'Dutch text', 'fr': 'French text', ...}
         """
-        descriptions_json = row.get("descriptions_json", {})
-        if isinstance(descriptions_json, str):
-            try:
-                descriptions_json = json.loads(descriptions_json)
-            except:
-                return None
+        descriptions_json = row.get("descriptions_json") or {}
 
         # Return only non-empty descriptions
         translations = {}
@@ -10,10 +10,11 @@ Usage:
 
 import click
 import logging
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.db.database import SessionLocal
-from app.sync.sync_manager import create_sync_manager
+from app.sync.sync_manager import IMPORTERS, create_sync_manager
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +23,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Source names accepted by --source
+SOURCES = tuple(IMPORTERS)
+
 
 @click.group()
 def cli():
@@ -30,9 +34,9 @@ def cli():
 
 
 @cli.command()
-@click.option('--source', type=click.Choice(['park4night', 'campercontact', 'local_sites', 'uitinvlaanderen', 'eventbrite', 'ticketmaster']), help='Specific source to sync')
+@click.option('--source', type=click.Choice(SOURCES), help='Specific source to sync')
 @click.option('--all', 'sync_all', is_flag=True, help='Sync all sources')
-@click.option('--batch-size', default=100, help='Batch size for processing')
+@click.option('--batch-size', default=1000, help='Batch size for processing')
 @click.option('--limit', type=int, help='Limit number of records (for testing)')
 def sync(source, sync_all, batch_size, limit):
     """Sync data from source databases"""
@@ -90,7 +94,7 @@ def sync(source, sync_all, batch_size, limit):
 
 
 @cli.command()
-@click.option('--source', type=click.Choice(['park4night', 'campercontact', 'local_sites', 'uitinvlaanderen', 'eventbrite', 'ticketmaster']), required=True)
+@click.option('--source', type=click.Choice(SOURCES), required=True)
 def test_connection(source):
     """Test connection to a source database"""
     from app.db.database import get_source_db_connection
@@ -100,7 +104,7 @@ def test_connection(source):
     try:
         engine = get_source_db_connection(source)
         with engine.connect() as conn:
-            result = conn.execute("SELECT 1")
+            result = conn.execute(text("SELECT 1"))
             result.fetchone()
 
         click.echo(f"✅ Connection to {source} successful!")
@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 import logging
 
-from app.db.database import get_source_db_connection
+from app.db.database import SessionLocal, get_source_db_connection
 from .park4night_importer import Park4NightImporter
 from .campercontact_importer import CamperContactImporter
 from .local_sites_importer import LocalSitesImporter
@@ -13,6 +15,27 @@ from .ticketmaster_importer import TicketmasterImporter
 
 logger = logging.getLogger(__name__)
 
+# Source name -> importer class, in default sync order
+IMPORTERS = {
+    "park4night": Park4NightImporter,
+    "campercontact": CamperContactImporter,
+    "local_sites": LocalSitesImporter,
+    "uitinvlaanderen": UiTinVlaanderenImporter,
+    "eventbrite": EventbriteImporter,
+    "ticketmaster": TicketmasterImporter,
+}
+
+
+@lru_cache(maxsize=None)
+def get_source_engine(source_name: str):
+    """
+    Return the engine for a source database, created once per process.
+
+    Engines are thread-safe and don't pool connections, so concurrent
+    and repeated syncs of a source can share one.
+    """
+    return get_source_db_connection(source_name)
+
 
 class SyncManager:
     """
@@ -21,19 +44,12 @@ class SyncManager:
 
     def __init__(self, target_session: Session):
         self.target_session = target_session
-        self.importers = {
-            "park4night": Park4NightImporter,
-            "campercontact": CamperContactImporter,
-            "local_sites": LocalSitesImporter,
-            "uitinvlaanderen": UiTinVlaanderenImporter,
-            "eventbrite": EventbriteImporter,
-            "ticketmaster": TicketmasterImporter,
-        }
+        self.importers = IMPORTERS
 
     def sync_source(
         self,
         source_name: str,
-        batch_size: int = 100,
+        batch_size: int = 1000,
         limit: Optional[int] = None
     ) -> Dict[str, int]:
         """
@@ -51,12 +67,12 @@ class SyncManager:
         if source_name not in self.importers:
             raise ValueError(f"Unknown source: {source_name}")
 
-        logger.info(f"Starting sync for {source_name}...")
+        logger.info("Starting sync for %s...", source_name)
         start_time = datetime.utcnow()
 
         try:
             # Get source database connection
-            source_engine = get_source_db_connection(source_name)
+            source_engine = get_source_engine(source_name)
 
             # Create importer instance
             importer_class = self.importers[source_name]
@@ -68,7 +84,7 @@ class SyncManager:
             end_time = datetime.utcnow()
             duration = (end_time - start_time).total_seconds()
 
-            logger.info(f"Sync for {source_name} completed in {duration:.2f}s: {stats}")
+            logger.info("Sync for %s completed in %.2fs: %s", source_name, duration, stats)
 
             return {
                 **stats,
@@ -79,18 +95,22 @@ class SyncManager:
             }
 
         except Exception as e:
-            logger.error(f"Error syncing {source_name}: {e}")
+            logger.error("Error syncing %s: %s", source_name, e)
             raise
 
     def sync_all(
         self,
-        batch_size: int = 100,
+        batch_size: int = 1000,
         limit: Optional[int] = None,
         sources: Optional[List[str]] = None
     ) -> Dict[str, Dict[str, int]]:
         """
         Sync data from all configured source databases.
 
+        Sources are independent and mostly wait on their databases, so they
+        are synced concurrently, one thread each. Every thread writes
+        through its own SessionLocal() session on the target session's engine.
+
         Args:
             batch_size: Number of records per batch
             limit: Optional limit on records per source
@@ -100,25 +120,33 @@ class SyncManager:
             Dictionary mapping source names to their sync statistics
         """
         sources_to_sync = sources or list(self.importers.keys())
-        results = {}
+        target_engine = self.target_session.get_bind()
 
-        logger.info(f"Starting sync for sources: {sources_to_sync}")
+        logger.info("Starting sync for sources: %s", sources_to_sync)
 
-        for source_name in sources_to_sync:
+        def sync_in_own_session(source_name: str) -> Dict[str, int]:
             try:
-                results[source_name] = self.sync_source(
-                    source_name=source_name,
-                    batch_size=batch_size,
-                    limit=limit
-                )
+                # SessionLocal's options, bound to the caller's engine
+                with SessionLocal(bind=target_engine) as session:
+                    return SyncManager(session).sync_source(
+                        source_name=source_name,
+                        batch_size=batch_size,
+                        limit=limit
+                    )
             except Exception as e:
-                logger.error(f"Failed to sync {source_name}: {e}")
-                results[source_name] = {
+                logger.error("Failed to sync %s: %s", source_name, e)
+                return {
                     "error": str(e),
                     "success": False,
                 }
 
-        logger.info(f"Sync completed for all sources: {results}")
+        with ThreadPoolExecutor(max_workers=max(len(sources_to_sync), 1)) as executor:
+            results = dict(zip(
+                sources_to_sync,
+                executor.map(sync_in_own_session, sources_to_sync)
+            ))
+
+        logger.info("Sync completed for all sources: %s", results)
         return results
 
 
@@ -1,11 +1,28 @@
 from typing import Dict, Any, Optional
-from .base_importer import BaseImporter
+from .base_importer import BaseImporter, parse_event_datetime
 from app.models import LocationType
 import logging
-import json
+import orjson
+import re
 
 logger = logging.getLogger(__name__)
 
+# Classification levels whose names become tags
+CLASSIFICATION_KEYS = ("genre", "subGenre", "type", "subType")
+
+# Keywords in the (lowercased) segment and the amenity they imply
+SEGMENT_KEYWORD_AMENITIES = {
+    "music": "entertainment",
+    "sports": "sports",
+    "theatre": "arts",
+    "arts": "arts",
+}
+# Finds all keywords of a segment in one scan; the lookahead lets matches
+# overlap ("artsports" has both arts and sports)
+SEGMENT_KEYWORD_PATTERN = re.compile("(?=(%s))" % "|".join(SEGMENT_KEYWORD_AMENITIES))
+# Amenities in the order they are listed on a location
+EVENT_AMENITIES = ("entertainment", "sports", "arts")
+
 
 class TicketmasterImporter(BaseImporter):
     """
@@ -23,7 +40,6 @@ class TicketmasterImporter(BaseImporter):
         """
         return """
             SELECT
-                id,
                 event_id,
                 name,
                 description,
@@ -39,7 +55,6 @@ class TicketmasterImporter(BaseImporter):
                 city,
                 postal_code,
                 country,
-                country_code,
                 latitude,
                 longitude,
                 price_min,
@@ -58,93 +73,112 @@ class TicketmasterImporter(BaseImporter):
             FROM scraper_4.events
             WHERE latitude IS NOT NULL
                 AND longitude IS NOT NULL
-            ORDER BY id
         """
 
     def transform_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
         """
         Transform Scraparr Ticketmaster event row to TripFlow Location format.
         """
+        # Fields used more than once below
+        event_id = row.get("event_id")
+        genre = row.get("genre")
+        segment = row.get("segment")
+        price_min = row.get("price_min")
+        price_max = row.get("price_max")
+        currency = row.get("currency")
+        latitude = row.get("latitude")
+        longitude = row.get("longitude")
+        image_url = row.get("image_url")
+        event_url = row.get("url")
+        venue_name = row.get("venue_name")
+        promoter_name = row.get("promoter_name")
+        start_date = row.get("start_date") or row.get("start_date_local")
+        # start_date is UTC; start_date_local is venue wall-clock time
+        start_datetime = parse_event_datetime(row.get("start_date"))
+        if start_datetime is None and row.get("timezone"):
+            start_datetime = parse_event_datetime(row.get("start_date_local"), row.get("timezone"))
+        has_price = price_min is not None and price_max is not None
+
         # Parse genre and segment into tags
         tags = []
-        if row.get("genre"):
-            tags.append(row["genre"])
-        if row.get("segment"):
-            tags.append(row["segment"])
+        if genre:
+            tags.append(genre)
+        if segment:
+            tags.append(segment)
 
         # Parse classifications JSON
         classifications = []
-        if row.get("classifications"):
-            try:
-                if isinstance(row["classifications"], str):
-                    classifications_data = json.loads(row["classifications"])
-                else:
-                    classifications_data = row["classifications"]
-
-                if isinstance(classifications_data, list):
-                    for classification in classifications_data:
-                        if isinstance(classification, dict):
-                            for key in ["genre", "subGenre", "type", "subType"]:
-                                if key in classification and classification[key]:
-                                    if isinstance(classification[key], dict) and "name" in classification[key]:
-                                        tags.append(classification[key]["name"])
-            except Exception as e:
-                logger.warning(f"Error parsing classifications for event {row.get('event_id')}: {e}")
-
-        # Remove duplicates from tags
-        tags = list(set(tags))
+        classifications_data = row.get("classifications")
+        if classifications_data:
+            # psycopg2 decodes json/jsonb values; only text needs parsing
+            if isinstance(classifications_data, (str, bytes)):
+                try:
+                    classifications_data = orjson.loads(classifications_data)
+                except orjson.JSONDecodeError as e:
+                    logger.warning(f"Error parsing classifications for event {event_id}: {e}")
+                    classifications_data = None
+
+            if isinstance(classifications_data, list):
+                tags.extend(
+                    level["name"]
+                    for classification in classifications_data
+                    if isinstance(classification, dict)
+                    for key in CLASSIFICATION_KEYS
+                    if isinstance(level := classification.get(key), dict) and "name" in level
+                )
+
+        # Remove duplicates from tags, keeping the first occurrence
+        tags = list(dict.fromkeys(tags))
 
         # Build features list
         features = []
-        if row.get("venue_name"):
-            features.append(f"Venue: {row['venue_name']}")
-        if row.get("promoter_name"):
-            features.append(f"Promoter: {row['promoter_name']}")
+        if venue_name:
+            features.append(f"Venue: {venue_name}")
+        if promoter_name:
+            features.append(f"Promoter: {promoter_name}")
 
         # Handle images
         images = []
         main_image = None
-        if row.get("image_url"):
-            images = [{"url": row["image_url"], "type": "photo", "ratio": row.get("image_ratio")}]
-            main_image = row["image_url"]
+        if image_url:
+            images = [{"url": image_url, "type": "photo", "ratio": row.get("image_ratio")}]
+            main_image = image_url
 
         # Determine price type
         price_type = "unknown"
-        if row.get("price_min") is not None and row.get("price_max") is not None:
-            if row["price_min"] == 0 and row["price_max"] == 0:
+        if has_price:
+            if price_min == 0 and price_max == 0:
                 price_type = "free"
             else:
                 price_type = "paid"
 
         # Determine amenities based on segment/genre
-        amenities = []
-        segment_lower = (row.get("segment") or "").lower()
-        genre_lower = (row.get("genre") or "").lower()
-
-        if "music" in segment_lower or "concert" in genre_lower:
-            amenities.append("entertainment")
-        if "sports" in segment_lower:
-            amenities.append("sports")
-        if "theatre" in segment_lower or "arts" in segment_lower:
-            amenities.append("arts")
+        found = {
+            SEGMENT_KEYWORD_AMENITIES[keyword]
+            for keyword in SEGMENT_KEYWORD_PATTERN.findall((segment or "").lower())
+        }
+        if "concert" in (genre or "").lower():
+            found.add("entertainment")
+        amenities = [amenity for amenity in EVENT_AMENITIES if amenity in found]
 
         # Build price info string
         price_info = None
-        if row.get("price_min") is not None and row.get("price_max") is not None:
-            if row["price_min"] == row["price_max"]:
-                price_info = f"{row['currency']} {row['price_min']}"
+        if has_price:
+            if price_min == price_max:
+                price_info = f"{currency} {price_min}"
             else:
-                price_info = f"{row['currency']} {row['price_min']} - {row['price_max']}"
+                price_info = f"{currency} {price_min} - {price_max}"
 
         # Create the transformed data
         return {
-            "external_id": f"ticketmaster_{row.get('event_id')}",
-            "name": row.get("name") or f"Event {row.get('event_id')}",
+            "external_id": f"ticketmaster_{event_id}",
+            "name": row.get("name") or f"Event {event_id}",
             "description": row.get("description") or row.get("info"),
             "location_type": LocationType.EVENT,
-            "latitude": float(row.get("latitude")) if row.get("latitude") else None,
-            "longitude": float(row.get("longitude")) if row.get("longitude") else None,
-            "geom": f"POINT({row.get('longitude')} {row.get('latitude')})" if row.get("longitude") and row.get("latitude") else None,
+            "event_start_datetime": start_datetime,
+            "event_end_datetime": None,
+            "latitude": float(latitude) if latitude else None,
+            "longitude": float(longitude) if longitude else None,
             "address": row.get("venue_address"),
             "city": row.get("city"),
             "region": None,
@@ -155,32 +189,34 @@ class TicketmasterImporter(BaseImporter):
             "rating": None,  # Ticketmaster doesn't provide ratings
             "review_count": 0,
             "price_type": price_type,
-            "price_min": float(row["price_min"]) if row.get("price_min") is not None else None,
-            "price_max": float(row["price_max"]) if row.get("price_max") is not None else None,
+            "price_min": float(price_min) if price_min is not None else None,
+            "price_max": float(price_max) if price_max is not None else None,
             "price_info": price_info,
-            "currency": row.get("currency"),
+            "currency": currency,
             "phone": None,
             "email": None,
-            "website": row.get("url"),
+            "website": event_url,
             "images": images,
             "main_image_url": main_image,
             "tags": tags,
             "active": row.get("status_code") in ["onsale", "offsale", "rescheduled"],
-            "source_url": row.get("url"),
-            "raw_data": json.dumps({
-                "event_id": row.get("event_id"),
-                "start_date": row.get("start_date").isoformat() if row.get("start_date") else row.get("start_date_local"),
+            "source_url": event_url,
+            # Stored as a JSONB object; the engine's orjson serializer writes
+            # datetimes and dates as ISO-8601 strings
+            "raw_data": {
+                "event_id": event_id,
+                "start_date": start_date,
                 "timezone": row.get("timezone"),
                 "status_code": row.get("status_code"),
                 "venue_id": row.get("venue_id"),
-                "venue_name": row.get("venue_name"),
-                "genre": row.get("genre"),
-                "segment": row.get("segment"),
+                "venue_name": venue_name,
+                "genre": genre,
+                "segment": segment,
                 "classifications": row.get("classifications"),
                 "promoter_id": row.get("promoter_id"),
-                "promoter_name": row.get("promoter_name"),
+                "promoter_name": promoter_name,
                 "external_links": row.get("external_links"),
-                "scraped_at": row.get("scraped_at").isoformat() if row.get("scraped_at") else None,
-                "updated_at": row.get("updated_at").isoformat() if row.get("updated_at") else None,
-            })
+                "scraped_at": row.get("scraped_at"),
+                "updated_at": row.get("updated_at"),
+            }
         }
@@ -1,26 +1,54 @@
 from typing import Dict, Any, Optional
-from .base_importer import BaseImporter
+from .base_importer import BaseImporter, parse_event_datetime
 from app.models import LocationType
 import logging
-import json
 import re
 import unicodedata
 
 logger = logging.getLogger(__name__)
 
 
+# Runs of characters that are not allowed in a slug
+SLUG_SEPARATOR_PATTERN = re.compile(r'[^a-z0-9]+')
+
+# uitinvlaanderen URLs with /e/ followed directly by a UUID
+# UUID pattern: 8-4-4-4-12 hex characters
+UIT_EVENT_URL_PATTERN = re.compile(
+    r'(https?://(?:www\.)?uitinvlaanderen\.be/agenda/e/)([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(.*)$',
+    re.IGNORECASE,
+)
+
+# Keywords in the (lowercased) themes and the amenity they imply
+THEME_KEYWORD_AMENITIES = {
+    'music': 'entertainment',
+    'concert': 'entertainment',
+    'food': 'restaurant',
+    'restaurant': 'restaurant',
+    'outdoor': 'outdoor',
+    'nature': 'outdoor',
+}
+# Finds all keywords of the themes in one scan; the lookahead lets matches
+# overlap, like independent substring checks
+THEME_KEYWORD_PATTERN = re.compile('(?=(%s))' % '|'.join(THEME_KEYWORD_AMENITIES))
+# Amenities in the order they are listed on a location
+THEME_AMENITIES = ('entertainment', 'restaurant', 'outdoor')
+
+
 def generate_slug(name: str) -> str:
     """Generate a URL-friendly slug from an event name."""
     if not name:
         return "event"
-    # Normalize unicode characters
-    slug = unicodedata.normalize('NFKD', name)
-    # Convert to ASCII, ignoring non-ASCII characters
-    slug = slug.encode('ascii', 'ignore').decode('ascii')
+    slug = name
+    # Most names are plain ASCII already and need no unicode handling
+    if not slug.isascii():
+        # Normalize unicode characters
+        slug = unicodedata.normalize('NFKD', slug)
+        # Convert to ASCII, ignoring non-ASCII characters
+        slug = slug.encode('ascii', 'ignore').decode('ascii')
     # Convert to lowercase
     slug = slug.lower()
     # Replace spaces and special characters with hyphens
-    slug = re.sub(r'[^a-z0-9]+', '-', slug)
+    slug = SLUG_SEPARATOR_PATTERN.sub('-', slug)
     # Remove leading/trailing hyphens
     slug = slug.strip('-')
     # Limit length
@@ -38,11 +66,7 @@ def fix_uitinvlaanderen_url(url: str, name: str) -> str:
     if not url:
         return url
 
-    # Pattern to match uitinvlaanderen URLs with /e/ followed directly by a UUID
-    # UUID pattern: 8-4-4-4-12 hex characters
-    pattern = r'(https?://(?:www\.)?uitinvlaanderen\.be/agenda/e/)([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(.*)$'
-
-    match = re.match(pattern, url, re.IGNORECASE)
+    match = UIT_EVENT_URL_PATTERN.match(url)
     if match:
         base = match.group(1)
         uuid = match.group(2)
@@ -69,7 +93,6 @@ class UiTinVlaanderenImporter(BaseImporter):
         """
         return """
             SELECT
-                id,
                 event_id,
                 name,
                 description,
@@ -92,13 +115,22 @@ class UiTinVlaanderenImporter(BaseImporter):
             FROM scraper_2.events
             WHERE latitude IS NOT NULL
                 AND longitude IS NOT NULL
-            ORDER BY id
         """
 
     def transform_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
         """
         Transform Scraparr UiT in Vlaanderen event row to TripFlow Location format.
         """
+        # Fields used more than once below
+        event_id = row.get("event_id")
+        name = row.get("name")
+        start_date = row.get("start_date")
+        end_date = row.get("end_date")
+        latitude = row.get("latitude")
+        longitude = row.get("longitude")
+        organizer = row.get("organizer")
+        image_url = row.get("image_url")
+
         # Parse themes into tags
         tags = []
         if row.get("themes"):
@@ -113,35 +145,36 @@ class UiTinVlaanderenImporter(BaseImporter):
         features = []
         if event_type:
             features.append(event_type)
-        if row.get("organizer"):
-            features.append(f"Organized by {row['organizer']}")
+        if organizer:
+            features.append(f"Organized by {organizer}")
 
         # Handle images
         images = []
         main_image = None
-        if row.get("image_url"):
-            images = [{"url": row["image_url"], "type": "photo"}]
-            main_image = row["image_url"]
+        if image_url:
+            images = [{"url": image_url, "type": "photo"}]
+            main_image = image_url
 
         # Determine amenities based on event type and themes
-        amenities = []
-        themes_lower = " ".join(tags).lower()
-        if "music" in themes_lower or "concert" in themes_lower:
-            amenities.append("entertainment")
-        if "food" in themes_lower or "restaurant" in themes_lower:
-            amenities.append("restaurant")
-        if "outdoor" in themes_lower or "nature" in themes_lower:
-            amenities.append("outdoor")
+        found = {
+            THEME_KEYWORD_AMENITIES[keyword]
+            for keyword in THEME_KEYWORD_PATTERN.findall(" ".join(tags).lower())
+        }
+        amenities = [amenity for amenity in THEME_AMENITIES if amenity in found]
+
+        # Used for both website and source_url
+        event_url = fix_uitinvlaanderen_url(row.get("url"), name)
 
         # Create the transformed data
         return {
-            "external_id": f"uit_{row.get('event_id')}",
-            "name": row.get("name") or f"Event {row.get('event_id')}",
+            "external_id": f"uit_{event_id}",
+            "name": name or f"Event {event_id}",
             "description": row.get("description"),
             "location_type": LocationType.EVENT,
-            "latitude": float(row.get("latitude")) if row.get("latitude") else None,
-            "longitude": float(row.get("longitude")) if row.get("longitude") else None,
-            "geom": f"POINT({row.get('longitude')} {row.get('latitude')})" if row.get("longitude") and row.get("latitude") else None,
+            "event_start_datetime": parse_event_datetime(start_date),
+            "event_end_datetime": parse_event_datetime(end_date),
+            "latitude": float(latitude) if latitude else None,
+            "longitude": float(longitude) if longitude else None,
             "address": row.get("street_address"),
             "city": row.get("city"),
             "region": None,
@@ -158,20 +191,22 @@ class UiTinVlaanderenImporter(BaseImporter):
             "currency": "EUR",
             "phone": None,
             "email": None,
-            "website": fix_uitinvlaanderen_url(row.get("url"), row.get("name")),
+            "website": event_url,
             "images": images,
             "main_image_url": main_image,
             "tags": tags,
             "active": True,
-            "source_url": fix_uitinvlaanderen_url(row.get("url"), row.get("name")),
-            "raw_data": json.dumps({
-                "event_id": row.get("event_id"),
+            "source_url": event_url,
+            # Stored as a JSONB object; the engine's orjson serializer writes
+            # datetimes as ISO-8601 strings
+            "raw_data": {
+                "event_id": event_id,
                 "event_type": event_type,
-                "organizer": row.get("organizer"),
-                "start_date": row.get("start_date"),
-                "end_date": row.get("end_date"),
+                "organizer": organizer,
+                "start_date": start_date,
+                "end_date": end_date,
                 "location_name": row.get("location_name"),
-                "scraped_at": row.get("scraped_at").isoformat() if row.get("scraped_at") else None,
-                "updated_at": row.get("updated_at").isoformat() if row.get("updated_at") else None,
-            })
+                "scraped_at": row.get("scraped_at"),
+                "updated_at": row.get("updated_at"),
+            }
         }
@@ -0,0 +1,14 @@
+-- Migration: Index event dates stored in locations.raw_data
+-- Date: 2025-11-20
+-- Description: Expression indexes for the expired event cleanup task, which
+--              compares raw_data->>'end_date' / 'start_date' as ISO-8601 text.
+--              CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+--              so run this file with psql's default autocommit.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loc_event_end
+    ON tripflow.locations ((raw_data->>'end_date'))
+    WHERE location_type = 'EVENT';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loc_event_start
+    ON tripflow.locations ((raw_data->>'start_date'))
+    WHERE location_type = 'EVENT';
@@ -0,0 +1,60 @@
+-- Migration: Store event dates of event locations in real columns
+-- Date: 2025-11-21
+-- Description: Promote raw_data start_date/end_date to timestamp columns so the
+--              expired event cleanup is a plain BTREE range delete. Replaces the
+--              raw_data expression indexes from 002.
+--              CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+--              block, so run this file with psql's default autocommit.
+
+ALTER TABLE tripflow.locations
+    ADD COLUMN IF NOT EXISTS event_start_datetime TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS event_end_datetime TIMESTAMP;
+
+-- Backfill from raw_data. Older imports stored raw_data as a JSON string
+-- holding the object, so unwrap those first. Dates without a UTC offset
+-- are taken as UTC, like the importers do: the cast to timestamptz reads
+-- them in the session TimeZone, so pin it for this transaction. Values
+-- that aren't valid dates (e.g. '0000-00-00', '2024-02-30', 'TBA') are
+-- left NULL instead of failing the whole UPDATE.
+BEGIN;
+SET LOCAL TimeZone = 'UTC';
+
+CREATE FUNCTION pg_temp.event_date_to_utc(value TEXT)
+RETURNS TIMESTAMP AS $$
+BEGIN
+    RETURN NULLIF(value, '')::timestamptz AT TIME ZONE 'UTC';
+EXCEPTION
+    WHEN data_exception THEN
+        RETURN NULL;
+END;
+$$ LANGUAGE plpgsql STRICT;
+
+UPDATE tripflow.locations l
+SET event_start_datetime = pg_temp.event_date_to_utc(d.data->>'start_date'),
+    event_end_datetime = pg_temp.event_date_to_utc(d.data->>'end_date')
+FROM (
+    SELECT id,
+           CASE WHEN jsonb_typeof(raw_data) = 'string'
+                THEN (raw_data #>> '{}')::jsonb
+                ELSE raw_data
+           END AS data
+    FROM tripflow.locations
+    WHERE location_type = 'EVENT' AND raw_data IS NOT NULL
+) d
+WHERE l.id = d.id;
+
+COMMIT;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loc_event_end_datetime
+    ON tripflow.locations (event_end_datetime)
+    WHERE location_type = 'EVENT';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loc_event_start_datetime
+    ON tripflow.locations (event_start_datetime)
+    WHERE location_type = 'EVENT' AND event_end_datetime IS NULL;
+
+DROP INDEX CONCURRENTLY IF EXISTS tripflow.idx_loc_event_end;
+DROP INDEX CONCURRENTLY IF EXISTS tripflow.idx_loc_event_start;
+
+COMMENT ON COLUMN tripflow.locations.event_start_datetime IS 'Event start (UTC), only for location_type EVENT';
+COMMENT ON COLUMN tripflow.locations.event_end_datetime IS 'Event end (UTC), only for location_type EVENT';
@@ -224,6 +224,40 @@ class TestTripPlanningService:
         assert len(results) > 0
         mock_location_service.find_locations_along_route.assert_called_once()
 
+    def test_suggest_waypoints_distributes_stops(self, mock_db_session):
+        """Test point-to-point suggestions are spread along the route without repeats"""
+        # Arrange
+        mock_trip = Mock(spec=Trip)
+        mock_trip.id = 1
+        mock_trip.start_latitude = 50.0
+        mock_trip.start_longitude = 4.0
+        mock_trip.end_latitude = 52.0
+        mock_trip.end_longitude = 4.0
+
+        mock_db_session.query.return_value.filter.return_value.first.return_value = mock_trip
+
+        along_route = []
+        for location_id, latitude in [(1, 51.5), (2, 50.5), (3, 51.0)]:
+            mock_location = Mock()
+            mock_location.id = location_id
+            mock_location.latitude = latitude
+            mock_location.longitude = 4.0
+            mock_location.rating = None
+            along_route.append({"location": mock_location, "distance_from_route_km": 0.0})
+
+        mock_location_service = Mock()
+        mock_location_service.find_locations_along_route.return_value = along_route
+
+        service = TripPlanningService(mock_db_session)
+        service.location_service = mock_location_service
+
+        # Act - more stops requested than candidates available
+        results = service.suggest_waypoints(trip_id=1, num_stops=4)
+
+        # Assert
+        assert [r["location"].id for r in results] == [2, 3, 1]
+        assert results[0]["combined_score"] == pytest.approx(0.8)
+
     def test_suggest_waypoints_round_trip(self, mock_db_session):
         """Test suggesting waypoints for round trip"""
         # Arrange
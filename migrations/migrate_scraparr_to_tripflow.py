@@ -39,6 +39,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Keywords in Park4Night etiquettes (tags) and the amenity they imply
+ETIQUETTE_AMENITIES = {
+    'douche': 'shower',
+    'shower': 'shower',
+    'toilette': 'toilet',
+    'wc': 'toilet',
+    'toilet': 'toilet',
+    'eau': 'water',
+    'water': 'water',
+    'vidange': 'waste_disposal',
+}
+# Finds all keywords of the (lowercased) etiquettes in one scan. The
+# lookahead lets matches overlap ('toiletteau' has both toilette and eau),
+# like independent substring checks.
+ETIQUETTE_AMENITY_PATTERN = re.compile('(?=(%s))' % '|'.join(ETIQUETTE_AMENITIES))
+
 
 class ScraparrToTripflowMigration:
     """Handles migration of data from Scraparr to Tripflow database."""
@@ -161,14 +177,13 @@ class ScraparrToTripflowMigration:
         # Parse etiquettes (tags) for additional amenities
         if row.get('etiquettes'):
             tags = str(row['etiquettes']).lower()
-            if 'douche' in tags or 'shower' in tags:
-                amenities.append('shower')
-            if 'toilette' in tags or 'wc' in tags or 'toilet' in tags:
-                amenities.append('toilet')
-            if 'eau' in tags or 'water' in tags:
-                amenities.append('water')
-            if 'vidange' in tags:
-                amenities.append('waste_disposal')
+            found = {
+                ETIQUETTE_AMENITIES[keyword]
+                for keyword in ETIQUETTE_AMENITY_PATTERN.findall(tags)
+            }
+            for amenity in ('shower', 'toilet', 'water', 'waste_disposal'):
+                if amenity in found:
+                    amenities.append(amenity)
 
         return amenities
 
@@ -12,18 +12,32 @@ import re
 import unicodedata
 
 
+# Runs of characters that are not allowed in a slug
+SLUG_SEPARATOR_PATTERN = re.compile(r'[^a-z0-9]+')
+
+# uitinvlaanderen URLs with /e/ followed directly by a UUID
+# UUID pattern: 8-4-4-4-12 hex characters
+UIT_EVENT_URL_PATTERN = re.compile(
+    r'(https?://(?:www\.)?uitinvlaanderen\.be/agenda/e/)([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(.*)$',
+    re.IGNORECASE,
+)
+
+
 def generate_slug(name: str) -> str:
     """Generate a URL-friendly slug from a name."""
     if not name:
         return "event"
-    # Normalize unicode characters
-    slug = unicodedata.normalize('NFKD', name)
-    # Convert to ASCII, ignoring non-ASCII characters
-    slug = slug.encode('ascii', 'ignore').decode('ascii')
+    slug = name
+    # Most names are plain ASCII already and need no unicode handling
+    if not slug.isascii():
+        # Normalize unicode characters
+        slug = unicodedata.normalize('NFKD', slug)
+        # Convert to ASCII, ignoring non-ASCII characters
+        slug = slug.encode('ascii', 'ignore').decode('ascii')
     # Convert to lowercase
     slug = slug.lower()
     # Replace spaces and special characters with hyphens
-    slug = re.sub(r'[^a-z0-9]+', '-', slug)
+    slug = SLUG_SEPARATOR_PATTERN.sub('-', slug)
     # Remove leading/trailing hyphens
     slug = slug.strip('-')
     # Limit length
@@ -41,10 +55,7 @@ def fix_uitinvlaanderen_url(url: str, name: str) -> str:
     if not url:
         return url
 
-    # Pattern to match uitinvlaanderen URLs with /e/ followed directly by a UUID
-    pattern = r'(https?://(?:www\.)?uitinvlaanderen\.be/agenda/e/)([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(.*)$'
-
-    match = re.match(pattern, url, re.IGNORECASE)
+    match = UIT_EVENT_URL_PATTERN.match(url)
     if match:
         base = match.group(1)
         uuid = match.group(2)